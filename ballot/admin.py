@@ -1,12 +1,78 @@
 from django.contrib import admin
-from django.urls import reverse
-from django.utils.html import format_html
-from django.http import HttpResponseRedirect
+from django.contrib.admin.widgets import AutocompleteSelectMultiple
+from django.core.paginator import Paginator
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from django.http import Http404, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.core.exceptions import PermissionDenied
 from django.contrib import messages
 from django.shortcuts import get_object_or_404
 from django import forms
-from .models import VotingEvent, Vote, Member, Submission, VotingReport, VotingEventInvitation
-import json
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.db.models import F
+from . import live
+from .counters import count_annotations
+from .exports import EXPORT_FORMATS, event_export_source, report_export_source, streaming_export_response
+from .models import VotingEvent, Vote, Member, Submission, VotingReport, VotingEventInvitation, InvitationEmail
+from .instrumentation import tag_request, tag_view
+from .invitations import create_invitations
+from .artifacts import artifact_page
+from .routers import replica_reads, stick_to_primary
+from .rolls import RollError, add_matching_members, copy_roll, remove_members, sync_roll
+from .reports import create_voting_report, summary_tables
+import io
+
+
+# Submissions per page of the admin report view, and the largest page a client may ask for
+REPORT_PAGE_SIZE = 100
+REPORT_MAX_PAGE_SIZE = 500
+
+# Members per page of the voting event roll editor
+ROLL_PAGE_SIZE = 100
+
+
+def _export_links_html(url_name, object_id):
+    """
+    Render one download button per export format for the given admin export URL.
+    """
+    return format_html_join(
+        ' ',
+        '<a href="{}" class="button">{}</a>',
+        (
+            (reverse(url_name, args=[object_id, export_format]), label)
+            for export_format, label in [('csv', 'CSV'), ('ndjson', 'NDJSON'), ('columnar', 'Columnar (binary)')]
+        )
+    )
+
+
+class RollAddMembersForm(forms.Form):
+    
+    def __init__(self, admin_site, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Searches the member admin through the autocomplete endpoint instead of listing every member
+        self.fields['members'] = forms.ModelMultipleChoiceField(
+            queryset=Member.objects.all(),
+            widget=AutocompleteSelectMultiple(VotingEvent._meta.get_field('members'), admin_site)
+        )
+
+
+class MemberImportForm(forms.Form):
+    csv_file = forms.FileField(
+        label='CSV file',
+        help_text="Columns: email, name, membership_weight (or weight). Members are matched by email."
+    )
+    voting_event = forms.ModelChoiceField(
+        queryset=VotingEvent.objects.all(),
+        required=False,
+        help_text="Optionally put every member in the file on the roll of this voting event"
+    )
+    replace = forms.BooleanField(
+        required=False,
+        help_text="Also take members that are not in the file off the voting event's roll"
+    )
+    dry_run = forms.BooleanField(required=False, initial=True, help_text="Only show what would change")
 
 
 @admin.register(Member)
@@ -15,6 +81,56 @@ class MemberAdmin(admin.ModelAdmin):
     list_filter = ['membership_weight']
     search_fields = ['name', 'email']
     ordering = ['name']
+    change_list_template = 'admin/ballot/member/change_list.html'
+    
+    def get_urls(self):
+        """
+        Add the roll import view to the member admin URLs.
+        """
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='ballot_member_import'),
+        ]
+        return urls + super().get_urls()
+    
+    def import_view(self, request):
+        """
+        Upload a member roll as CSV, diff it against the existing members and apply it in bulk.
+        With dry run checked (the default) the changes are only listed; otherwise they are written in
+        one transaction and optionally added to a voting event's roll, see ballot.rolls.sync_roll.
+        """
+        if not (self.has_add_permission(request) and self.has_change_permission(request)):
+            raise PermissionDenied
+        
+        result = None
+        form = MemberImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data['csv_file'].file, encoding='utf-8-sig', newline='')
+            try:
+                result = sync_roll(
+                    lines,
+                    voting_event=form.cleaned_data['voting_event'],
+                    replace=form.cleaned_data['replace'],
+                    dry_run=form.cleaned_data['dry_run']
+                )
+            except (RollError, UnicodeDecodeError) as error:
+                form.add_error('csv_file', str(error))
+            else:
+                if not form.cleaned_data['dry_run']:
+                    messages.success(
+                        request,
+                        f'Created {result.created}, updated {result.updated} and kept {result.unchanged} members; '
+                        f'{result.attached} added to and {result.detached} removed from the voting event roll.'
+                    )
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import members',
+            'form': form,
+            'result': result,
+            'preview_rows': 50,
+        }
+        return TemplateResponse(request, 'admin/ballot/member/import.html', context)
 
 
 @admin.register(VotingEvent)
@@ -22,48 +138,90 @@ class VotingEventAdmin(admin.ModelAdmin):
     list_display = ['title', 'state', 'created_at', 'member_count', 'vote_count', 'submission_count']
     list_filter = ['state', 'created_at']
     search_fields = ['title']
-    filter_horizontal = ['members']
-    readonly_fields = ['created_at', 'updated_at', 'existing_reports_display']
+    readonly_fields = [
+        'created_at', 'updated_at', 'live_turnout', 'members_summary', 'existing_reports_display', 'export_links'
+    ]
+    actions = ['invite_members_action']
     
     fieldsets = (
         (None, {
             'fields': ('title', 'state')
         }),
+        ('Live Turnout', {
+            'fields': ('live_turnout',),
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
         ('Members', {
-            'fields': ('members',)
+            'fields': ('members_summary',)
         }),
         ('Reports', {
-            'fields': ('existing_reports_display',),
+            'fields': ('existing_reports_display', 'export_links'),
         }),
     )
     
+    class Media:
+        js = ('admin/js/live_turnout.js',)
+    
+    def get_queryset(self, request):
+        """
+        Annotate the member, vote and submission counts so the changelist needs a fixed number of queries.
+        By default the counts are computed with one correlated subquery each; with BALLOT_PRECOMPUTED_COUNTERS
+        enabled they are read from the counter columns refreshed by the refresh_event_counters command instead,
+        which votes and roll edits also keep current.
+        """
+        queryset = super().get_queryset(request)
+        if settings.BALLOT_PRECOMPUTED_COUNTERS:
+            return queryset.annotate(
+                _member_count=F('member_total'),
+                _vote_count=F('vote_total'),
+                _submission_count=F('submission_total')
+            )
+        return queryset.annotate(**count_annotations())
+    
     def member_count(self, obj):
         """
         Display the number of members associated with a voting event in the admin list view.
-        This method counts all members linked to the voting event through the many-to-many relationship.
+        The count is annotated on the changelist queryset through the many-to-many through table.
         """
-        return obj.members.count()
+        return obj._member_count
     member_count.short_description = 'Members'
+    member_count.admin_order_field = '_member_count'
     
     def vote_count(self, obj):
         """
         Display the number of votes (questions) configured for a voting event in the admin list view.
-        This counts all Vote objects that belong to this voting event, representing the different questions or items to vote on.
+        The count is annotated on the changelist queryset and represents the different questions or items to vote on.
         """
-        return obj.votes.count()
+        return obj._vote_count
     vote_count.short_description = 'Votes'
+    vote_count.admin_order_field = '_vote_count'
     
     def submission_count(self, obj):
         """
         Display the number of member submissions received for a voting event in the admin list view.
-        This counts all completed voting submissions from members, indicating how many people have actually voted.
+        The count is annotated on the changelist queryset and indicates how many people have actually voted.
         """
-        return obj.submissions.count()
+        return obj._submission_count
     submission_count.short_description = 'Submissions'
+    submission_count.admin_order_field = '_submission_count'
+    
+    @method_decorator(replica_reads)
+    def changelist_view(self, request, extra_context=None):
+        """
+        Read the changelist and its member, vote and submission counts from the read replica, if configured,
+        so browsing events during a vote doesn't load the primary. Actions (POST) still run on the primary.
+        """
+        return super().changelist_view(request, extra_context)
+    
+    def save_model(self, request, obj, form, change):
+        """
+        Save on the primary and keep this admin's changelist reads there until the replica has the change.
+        """
+        super().save_model(request, obj, form, change)
+        stick_to_primary(request)
     
     def change_view(self, request, object_id, form_url='', extra_context=None):
         """
@@ -95,43 +253,48 @@ class VotingEventAdmin(admin.ModelAdmin):
     def invite_members(self, request, voting_event):
         """
         Create voting invitations for all members and open the voting event.
-        This method generates unique invitation tokens for each member associated with the voting event,
-        changes the event state to 'open', and provides feedback on how many new invitations were created.
-        Future enhancement will include sending invitation emails via Brevo API.
-        """
-        # Create invitations for all members
-        created_count = 0
-        for member in voting_event.members.all():
-            invitation, created = VotingEventInvitation.objects.get_or_create(
-                voting_event=voting_event,
-                member=member
-            )
-            if created:
-                created_count += 1
-        
-        # TODO: Implement Brevo email sending logic
-        voting_event.state = 'open'
-        voting_event.save()
+        This method bulk-creates unique invitation tokens for every member that doesn't have one yet,
+        changes the event state to 'open' in the same transaction, and reports row counts and timing.
+        Invitation emails are only queued here; the dispatch_invitation_emails worker sends them in the background.
+        """
+        tag_request(request, 'admin.votingevent.invite_members')
+        result = create_invitations(voting_event)
         
-        messages.success(request, f'Created {created_count} new invitations. Voting event is now open.')
+        messages.success(
+            request,
+            f'Created {result.created} new invitations ({result.existing} already existed) '
+            f'and queued {result.queued} emails in {result.elapsed:.2f}s. Voting event is now open.'
+        )
         return HttpResponseRedirect(request.path)
     
+    @admin.action(description='Send invitations & open voting')
+    def invite_members_action(self, request, queryset):
+        """
+        Bulk admin action that invites the members of every selected voting event and opens them.
+        Each event is processed in its own transaction, so a failure on one event doesn't roll back the others.
+        """
+        tag_request(request, 'admin.votingevent.invite_members_action')
+        for voting_event in queryset:
+            result = create_invitations(voting_event)
+            messages.success(
+                request,
+                f'{voting_event}: created {result.created} new invitations ({result.existing} already existed) '
+                f'and queued {result.queued} emails in {result.elapsed:.2f}s. Voting event is now open.'
+            )
+    
     def generate_report(self, request, voting_event):
         """
         Generate a comprehensive voting report for the current voting event.
-        This method creates a detailed JSON report containing vote structures, all member submissions,
-        and statistical summaries, then saves it as a VotingReport object and redirects to view the report.
+        This method stores the vote structures and statistical summaries on a VotingReport object, with all
+        member submissions in a compressed report artifact, and redirects to view the report.
         """
-        # Generate the voting report
-        report_data = self._generate_report_data(voting_event)
-        
-        report = VotingReport.objects.create(
-            voting_event=voting_event,
-            report_data=report_data
-        )
+        tag_request(request, 'admin.votingevent.generate_report')
+        report = create_voting_report(voting_event)
+        # The report page that follows reads from the replica, which may not have the report yet
+        stick_to_primary(request)
         
         messages.success(request, f'Voting report generated successfully.')
-        return HttpResponseRedirect(reverse('admin:ballot_votingreport_change', args=[report.pk]))
+        return HttpResponseRedirect(reverse('admin:ballot_votingreport_view', args=[report.pk]))
     
     
     def existing_reports_display(self, obj):
@@ -143,13 +306,13 @@ class VotingEventAdmin(admin.ModelAdmin):
         if not obj.pk:
             return "No reports available for new voting events."
         
-        reports = obj.reports.all()
+        reports = obj.reports.only('pk', 'created_at')
         if not reports:
             return "No reports generated yet."
         
         html_parts = []
         for report in reports:
-            url = reverse('admin:ballot_votingreport_change', args=[report.pk])
+            url = reverse('admin:ballot_votingreport_view', args=[report.pk])
             html_parts.append(
                 f'<p><a href="{url}" class="button">View Report - {report.created_at.strftime("%Y-%m-%d %H:%M")}</a></p>'
             )
@@ -157,71 +320,190 @@ class VotingEventAdmin(admin.ModelAdmin):
         return format_html(''.join(html_parts))
     existing_reports_display.short_description = 'Existing Reports'
     
-    def _generate_report_data(self, voting_event):
+    def export_links(self, obj):
         """
-        Generate comprehensive JSON report data structure for a voting event.
-        This private method creates a detailed report containing vote configurations, all member submissions,
-        and statistical summaries including both raw counts and weighted results based on membership weights.
-        The report structure includes vote metadata, individual responses, and aggregated statistics.
+        Display download links for streaming exports of the live submissions of a voting event.
+        The exports are generated row by row from a server-side cursor, so they work for events of any size.
         """
-        report = {
-            "Id": str(voting_event.id),
-            "voting_event_id": str(voting_event.id),
-            "title": voting_event.title,
-            "votes": [],
-            "submissions": [],
-            "summary": {}
-        }
+        if not obj.pk:
+            return "Exports are available once the voting event is saved."
+        return _export_links_html('admin:ballot_votingevent_export', obj.pk)
+    export_links.short_description = 'Export Submissions'
+    
+    def members_summary(self, obj):
+        """
+        Show the size of the roll and link to the roll editor. The roll is edited on its own page,
+        since rendering every member as a select option doesn't scale to large organisations.
+        """
+        if not obj.pk:
+            return "Members can be added once the voting event is saved."
+        return format_html(
+            '{} members <a href="{}" class="button">Edit roll</a>',
+            obj.members.count(),
+            reverse('admin:ballot_votingevent_members', args=[obj.pk])
+        )
+    members_summary.short_description = 'Roll'
+    
+    def live_turnout(self, obj):
+        """
+        Button that makes live_turnout.js follow the event's Server-Sent Events feed, so the turnout
+        updates as votes come in without reloading the page. The feed is opt-in, as under WSGI every
+        open stream holds a server thread (for at most BALLOT_LIVE_MAX_SECONDS).
+        """
+        if not obj.pk:
+            return "Live turnout is available once the voting event is saved."
+        return format_html(
+            '<div class="live-turnout" data-url="{}?tallies=1">'
+            '<button type="button" class="button live-turnout-start">Show live turnout</button></div>',
+            reverse('admin:ballot_votingevent_live', args=[obj.pk])
+        )
+    live_turnout.short_description = 'Turnout'
+    
+    def get_urls(self):
+        """
+        Add the submission export and live turnout endpoints to the voting event admin URLs.
+        """
+        urls = [
+            path(
+                '<path:object_id>/export/<str:export_format>/',
+                self.admin_site.admin_view(self.export_view),
+                name='ballot_votingevent_export'
+            ),
+            path(
+                '<path:object_id>/live/',
+                self.admin_site.admin_view(self.live_view),
+                name='ballot_votingevent_live'
+            ),
+            path(
+                '<path:object_id>/members/',
+                self.admin_site.admin_view(self.members_view),
+                name='ballot_votingevent_members'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    @tag_view('admin.votingevent.export')
+    @method_decorator(replica_reads)
+    def export_view(self, request, object_id, export_format):
+        """
+        Stream all submissions of a voting event as CSV, NDJSON or the compact columnar binary format.
+        """
+        voting_event = get_object_or_404(VotingEvent, pk=object_id)
+        if not self.has_view_permission(request, voting_event):
+            raise PermissionDenied
+        if export_format not in EXPORT_FORMATS:
+            raise Http404(f"Unknown export format {export_format!r}")
         
-        # Add votes structure
-        for vote in voting_event.votes.all():
-            vote_data = {
-                "id": str(vote.id),
-                "type": vote.vote_type,
-                "title": vote.title,
-                "description": vote.description,
-            }
-            
-            if vote.vote_type == 'simple':
-                vote_data["options"] = [
-                    {"id": "agree", "label": "Agree"},
-                    {"id": "disagree", "label": "Disagree"},
-                    {"id": "abstain", "label": "Abstain"}
-                ]
-            elif vote.vote_type == 'short_text':
-                vote_data["default_value"] = vote.type_specific_data.get('default_value', '')
-            elif vote.vote_type == 'radio':
-                vote_data["options"] = vote.type_specific_data.get('options', [])
-            
-            report["votes"].append(vote_data)
+        votes, rows = event_export_source(voting_event)
+        return streaming_export_response(votes, rows, export_format, f'voting-event-{voting_event.pk}')
+    
+    def _search_members(self, request, queryset, query):
+        """
+        Filter members with the member admin's search, so the roll editor matches the member changelist.
+        """
+        if not query:
+            return queryset
+        queryset, _ = self.admin_site._registry[Member].get_search_results(request, queryset, query)
+        return queryset
+    
+    @tag_view('admin.votingevent.members')
+    def members_view(self, request, object_id):
+        """
+        Edit the roll of a voting event without loading all members into the page.
+        Members are picked through the member admin's autocomplete, or added in bulk (everyone matching
+        a search, or the whole roll of another event) and removed in bulk with set-based SQL from
+        ballot.rolls. Clearing the whole roll asks for confirmation and isn't possible while the event
+        is open. The current roll is searchable and paginated.
+        """
+        voting_event = get_object_or_404(VotingEvent, pk=object_id)
+        if not self.has_view_permission(request, voting_event):
+            raise PermissionDenied
         
-        # Add submissions and calculate summary
-        vote_summaries = {}
+        add_form = RollAddMembersForm(
+            self.admin_site, request.POST if request.POST.get('action') == 'add_selected' else None
+        )
         
-        for submission in voting_event.submissions.all():
-            submission_data = {
-                "member_id": submission.member.id,
-                "member_email": submission.member.email,
-                "weight": submission.member.membership_weight,
-                "votes": submission.submission_data
-            }
-            report["submissions"].append(submission_data)
+        if request.method == 'POST':
+            if not self.has_change_permission(request, voting_event):
+                raise PermissionDenied
+            action = request.POST.get('action')
+            query = request.POST.get('q', '').strip()
             
-            # Calculate summary
-            for vote_key, vote_value in submission.submission_data.items():
-                if vote_key not in vote_summaries:
-                    vote_summaries[vote_key] = {"count": {}, "weighted": {}}
-                
-                # Count occurrences
-                if vote_value not in vote_summaries[vote_key]["count"]:
-                    vote_summaries[vote_key]["count"][vote_value] = 0
-                    vote_summaries[vote_key]["weighted"][vote_value] = 0
-                
-                vote_summaries[vote_key]["count"][vote_value] += 1
-                vote_summaries[vote_key]["weighted"][vote_value] += submission.member.membership_weight
+            if action == 'add_selected' and add_form.is_valid():
+                count = add_matching_members(voting_event, add_form.cleaned_data['members'])
+                messages.success(request, f'Added {count} members to the roll.')
+            elif action == 'add_matching' and query:
+                count = add_matching_members(voting_event, self._search_members(request, Member.objects.all(), query))
+                messages.success(request, f'Added {count} members matching "{query}" to the roll.')
+            elif action == 'copy_roll' and request.POST.get('source_event', '').isdigit():
+                source_event = get_object_or_404(VotingEvent, pk=request.POST['source_event'])
+                count = copy_roll(voting_event, source_event)
+                messages.success(request, f'Added {count} members from the roll of {source_event}.')
+            elif action == 'remove_selected':
+                selected = [member_id for member_id in request.POST.getlist('selected') if member_id.isdigit()]
+                count = remove_members(voting_event, Member.objects.filter(pk__in=selected))
+                messages.success(request, f'Removed {count} members from the roll.')
+            elif action == 'remove_matching' and not query:
+                if voting_event.state == 'open':
+                    messages.error(request, 'The roll of an open voting event can\'t be cleared. Close the event first.')
+                elif request.POST.get('confirm') != 'yes':
+                    context = {
+                        **self.admin_site.each_context(request),
+                        'opts': self.model._meta,
+                        'title': f'Clear the roll of {voting_event}?',
+                        'voting_event': voting_event,
+                        'member_count': voting_event.members.count(),
+                    }
+                    return TemplateResponse(request, 'admin/ballot/votingevent/members_clear.html', context)
+                else:
+                    count = remove_members(voting_event, Member.objects.all())
+                    messages.success(request, f'Removed all {count} members from the roll.')
+            elif action == 'remove_matching':
+                members = self._search_members(request, Member.objects.all(), query)
+                count = remove_members(voting_event, members)
+                messages.success(request, f'Removed {count} members matching "{query}" from the roll.')
+            else:
+                messages.error(request, 'Nothing to do: pick members, enter a search or choose an event.')
+            return HttpResponseRedirect(request.get_full_path())
         
-        report["summary"] = vote_summaries
-        return report
+        query = request.GET.get('q', '').strip()
+        roll = self._search_members(request, voting_event.members.all(), query).order_by('name', 'pk')
+        page = Paginator(roll, ROLL_PAGE_SIZE).get_page(request.GET.get('page'))
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f'Roll of {voting_event}',
+            'voting_event': voting_event,
+            'add_form': add_form,
+            'media': self.media + add_form.media,
+            'page': page,
+            'query': query,
+            'other_events': VotingEvent.objects.exclude(pk=voting_event.pk).only('pk', 'title'),
+        }
+        return TemplateResponse(request, 'admin/ballot/votingevent/members.html', context)
+    
+    @tag_view('admin.votingevent.live')
+    def live_view(self, request, object_id):
+        """
+        Stream turnout (and with ?tallies=1 the live results) of a voting event as Server-Sent Events.
+        All open dashboards of an event share one snapshot per change, computed by ballot.live.
+        Under ASGI (BALLOT_ASYNC_VIEWS) the stream is an async iterator and holds no worker thread;
+        under WSGI it ends after BALLOT_LIVE_MAX_SECONDS, so dashboards left open give their thread back.
+        """
+        voting_event = get_object_or_404(VotingEvent.objects.only('pk'), pk=object_id)
+        if not self.has_view_permission(request, voting_event):
+            raise PermissionDenied
+        
+        include_tallies = request.GET.get('tallies') == '1'
+        if settings.BALLOT_ASYNC_VIEWS:
+            events = live.aiter_events(voting_event.pk, include_tallies)
+        else:
+            events = live.iter_events(voting_event.pk, include_tallies, max_seconds=settings.BALLOT_LIVE_MAX_SECONDS)
+        response = StreamingHttpResponse(events, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
 
 class VoteAdminForm(forms.ModelForm):
@@ -296,10 +578,11 @@ class SubmissionAdmin(admin.ModelAdmin):
 
 @admin.register(VotingEventInvitation)
 class VotingEventInvitationAdmin(admin.ModelAdmin):
-    list_display = ['member', 'voting_event', 'created_at', 'used_at', 'is_used']
-    list_filter = ['voting_event', 'created_at', 'used_at']
+    list_display = ['member', 'voting_event', 'created_at', 'used_at', 'is_used', 'delivery_state']
+    list_filter = ['voting_event', 'created_at', 'used_at', 'email__state']
+    list_select_related = ['member', 'voting_event', 'email']
     search_fields = ['member__name', 'member__email', 'voting_event__title', 'secret']
-    readonly_fields = ['secret', 'created_at', 'used_at', 'voting_link']
+    readonly_fields = ['secret', 'created_at', 'used_at', 'voting_link', 'delivery_state', 'delivery_details']
     
     fieldsets = (
         (None, {
@@ -313,6 +596,10 @@ class VotingEventInvitationAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'used_at'),
             'classes': ('collapse',)
         }),
+        ('Email Delivery', {
+            'fields': ('delivery_state', 'delivery_details'),
+            'classes': ('collapse',)
+        }),
     )
     
     def is_used(self, obj):
@@ -337,34 +624,192 @@ class VotingEventInvitationAdmin(admin.ModelAdmin):
             return format_html('<a href="{}" target="_blank">{}</a>', url, url)
         return "No link available"
     voting_link.short_description = 'Voting Link'
+    
+    def delivery_state(self, obj):
+        """
+        Display the delivery state of the invitation email next to the usage information.
+        Invitations created before the email outbox existed, or never queued, show as not queued.
+        """
+        try:
+            return obj.email.get_state_display()
+        except InvitationEmail.DoesNotExist:
+            return 'Not queued'
+    delivery_state.short_description = 'Email'
+    delivery_state.admin_order_field = 'email__state'
+    
+    def delivery_details(self, obj):
+        """
+        Show the number of delivery attempts, the time of the next retry or of the successful send,
+        and the last error reported by the mail provider for this invitation email.
+        """
+        try:
+            email = obj.email
+        except InvitationEmail.DoesNotExist:
+            return '-'
+        if email.state == 'sent':
+            return f'Sent {email.sent_at:%Y-%m-%d %H:%M} after {email.attempts} attempt(s)'
+        details = f'{email.attempts} attempt(s)'
+        if email.state == 'pending':
+            details += f', next attempt {email.next_attempt_at:%Y-%m-%d %H:%M}'
+        if email.last_error:
+            details += f', last error: {email.last_error}'
+        return details
+    delivery_details.short_description = 'Delivery Details'
 
 
 @admin.register(VotingReport)
 class VotingReportAdmin(admin.ModelAdmin):
-    list_display = ['voting_event', 'created_at']
+    list_display = ['voting_event', 'created_at', 'submission_count', 'total_weight']
     list_filter = ['voting_event', 'created_at']
-    readonly_fields = ['created_at', 'formatted_report_data']
+    list_select_related = ['voting_event']
+    readonly_fields = [
+        'created_at', 'submission_count', 'total_weight', 'report_link', 'artifact_details', 'export_links'
+    ]
     
     fieldsets = (
         (None, {
-            'fields': ('voting_event', 'created_at')
+            'fields': ('voting_event', 'created_at', 'submission_count', 'total_weight', 'report_link')
         }),
-        ('Report Data', {
-            'fields': ('formatted_report_data',),
-            'classes': ('collapse',)
+        ('Submissions', {
+            'fields': ('artifact_details', 'export_links')
         }),
     )
     
-    def formatted_report_data(self, obj):
+    def get_queryset(self, request):
         """
-        Display the JSON report data in a readable, formatted way in the admin interface.
-        This method takes the raw JSON report data and formats it with proper indentation
-        and syntax highlighting within a preformatted text block for easy reading and analysis.
+        Leave the report summary out of changelist and change form queries; only the report view renders it.
+        """
+        return super().get_queryset(request).defer('summary_data')
+    
+    @method_decorator(replica_reads)
+    def changelist_view(self, request, extra_context=None):
         """
-        if obj.report_data:
-            return format_html('<pre>{}</pre>', json.dumps(obj.report_data, indent=2))
-        return "No data"
-    formatted_report_data.short_description = 'Report Data (Formatted)'
+        Read the report changelist from the read replica, if configured.
+        """
+        return super().changelist_view(request, extra_context)
+    
+    @method_decorator(replica_reads)
+    def delete_view(self, request, object_id, extra_context=None):
+        """
+        Show the deletion confirmation from the read replica, if configured. The deletion itself runs on the
+        primary, and the changelist shown after it is read there too until the replica has caught up.
+        """
+        return super().delete_view(request, object_id, extra_context)
+    
+    def report_link(self, obj):
+        """
+        Link to the report view, which renders the summary and pages through the submissions on demand.
+        """
+        return format_html(
+            '<a href="{}" class="button">View Report</a>',
+            reverse('admin:ballot_votingreport_view', args=[obj.pk])
+        )
+    report_link.short_description = 'Report'
+    
+    def artifact_details(self, obj):
+        """
+        Describe the compressed artifact holding the submissions of this report.
+        """
+        artifact = obj.artifact
+        if artifact is None:
+            return "No submissions stored"
+        return format_html(
+            '{} rows, {} chunks, {} bytes ({})<br>sha256 {}',
+            artifact.row_count,
+            artifact.chunks.count(),
+            artifact.compressed_size,
+            artifact.get_encoding_display(),
+            artifact.content_hash
+        )
+    artifact_details.short_description = 'Stored Submissions'
+    
+    def export_links(self, obj):
+        """
+        Display download links for streaming exports of the submissions captured in this report.
+        """
+        return _export_links_html('admin:ballot_votingreport_export', obj.pk)
+    export_links.short_description = 'Export Submissions'
+    
+    def get_urls(self):
+        """
+        Add the report view, its paginated submissions endpoint and the submission export endpoint
+        to the voting report admin URLs.
+        """
+        urls = [
+            path(
+                '<path:object_id>/view/',
+                self.admin_site.admin_view(self.report_view),
+                name='ballot_votingreport_view'
+            ),
+            path(
+                '<path:object_id>/submissions/',
+                self.admin_site.admin_view(self.submissions_view),
+                name='ballot_votingreport_submissions'
+            ),
+            path(
+                '<path:object_id>/export/<str:export_format>/',
+                self.admin_site.admin_view(self.export_view),
+                name='ballot_votingreport_export'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def _get_viewable_report(self, request, object_id):
+        report = get_object_or_404(VotingReport.objects.select_related('voting_event', 'artifact'), pk=object_id)
+        if not self.has_view_permission(request, report):
+            raise PermissionDenied
+        return report
+    
+    @tag_view('admin.votingreport.view')
+    @method_decorator(replica_reads)
+    def report_view(self, request, object_id):
+        """
+        Render the report summary server-side. Submissions are not loaded here; the page fetches them
+        from submissions_view one page at a time, so opening a report costs the same whatever its size.
+        """
+        report = self._get_viewable_report(request, object_id)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': str(report),
+            'report': report,
+            'tables': summary_tables(report.summary_data),
+            'submissions_url': reverse('admin:ballot_votingreport_submissions', args=[report.pk]),
+            'page_size': REPORT_PAGE_SIZE,
+            'export_links': _export_links_html('admin:ballot_votingreport_export', report.pk),
+        }
+        return TemplateResponse(request, 'admin/ballot/votingreport/report_view.html', context)
+    
+    @tag_view('admin.votingreport.submissions')
+    @method_decorator(replica_reads)
+    def submissions_view(self, request, object_id):
+        """
+        Return one page of the report's submissions as JSON, using keyset pagination over member id:
+        pass the returned 'next' value as ?after= to get the following page.
+        """
+        report = self._get_viewable_report(request, object_id)
+        try:
+            after = request.GET.get('after')
+            after = int(after) if after else None
+            limit = min(max(int(request.GET.get('limit', REPORT_PAGE_SIZE)), 1), REPORT_MAX_PAGE_SIZE)
+        except ValueError:
+            return JsonResponse({'error': 'after and limit must be integers'}, status=400)
+        
+        rows, next_after = artifact_page(report.artifact, after_member_id=after, limit=limit)
+        return JsonResponse({'submissions': rows, 'next': next_after})
+    
+    @tag_view('admin.votingreport.export')
+    @method_decorator(replica_reads)
+    def export_view(self, request, object_id, export_format):
+        """
+        Stream the submissions captured in a voting report as CSV, NDJSON or the compact columnar binary format.
+        """
+        report = self._get_viewable_report(request, object_id)
+        if export_format not in EXPORT_FORMATS:
+            raise Http404(f"Unknown export format {export_format!r}")
+        
+        votes, rows = report_export_source(report)
+        return streaming_export_response(votes, rows, export_format, f'voting-report-{report.pk}')
     
     def has_add_permission(self, request):
         """
@@ -0,0 +1,36 @@
+from django.db.models import Count, Sum
+
+from .models import SubmissionAnswer
+
+
+def record_answers(submission, weight):
+    """
+    Store one SubmissionAnswer row per answered vote of a freshly created submission.
+    Must be called inside the transaction that created the submission. The member weight
+    is snapshotted so later weight changes don't silently rewrite past results.
+    """
+    SubmissionAnswer.objects.bulk_create([
+        SubmissionAnswer(submission=submission, vote_id=int(vote_key), value=value, weight=weight)
+        for vote_key, value in submission.submission_data.items()
+    ])
+
+
+def summarize_answers(voting_event):
+    """
+    Build the report summary structure with one indexed GROUP BY over the answer table.
+    Works on every database backend, unlike the JSON based aggregation.
+    """
+    rows = SubmissionAnswer.objects.filter(vote__voting_event=voting_event).values(
+        'vote_id', 'value'
+    ).annotate(
+        count=Count('id'),
+        weighted=Sum('weight')
+    ).order_by('vote_id', 'value')
+
+    summary = {}
+    for row in rows:
+        vote_summary = summary.setdefault(str(row['vote_id']), {"count": {}, "weighted": {}})
+        vote_summary["count"][row['value']] = row['count']
+        vote_summary["weighted"][row['value']] = row['weighted']
+    return summary
+
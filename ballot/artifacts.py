@@ -0,0 +1,175 @@
+import gzip
+import hashlib
+import json
+
+from django.db import IntegrityError, transaction
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Submissions per compressed chunk; a chunk is the unit that is loaded and decompressed
+ARTIFACT_CHUNK_ROWS = 1000
+
+
+def default_encoding():
+    """
+    Zstandard when the optional zstandard package is installed, gzip otherwise.
+    """
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def compress(data, encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data, encoding):
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("This report artifact is Zstandard compressed; install the zstandard package to read it.")
+        return zstandard.ZstdDecompressor().decompress(bytes(data))
+    return gzip.decompress(bytes(data))
+
+
+def submission_line(member_id, email, weight, votes):
+    """
+    Canonical NDJSON line for one submission of a report, used both for storage and hashing.
+    """
+    return json.dumps(
+        {'member_id': member_id, 'member_email': email, 'weight': weight, 'votes': votes},
+        sort_keys=True,
+        separators=(',', ':')
+    ).encode() + b'\n'
+
+
+class ArtifactBuilder:
+    """
+    Turns a stream of submission rows, in member id order, into compressed chunks and a content hash.
+    Only the compressed chunks are kept in memory; the hash covers the canonical row encoding, so
+    regenerating a report from unchanged submissions yields the same hash and can reuse the artifact.
+    """
+
+    def __init__(self, encoding=None, chunk_rows=None):
+        self.encoding = encoding or default_encoding()
+        self.chunk_rows = chunk_rows or ARTIFACT_CHUNK_ROWS
+        self.hasher = hashlib.sha256()
+        self.chunks = []
+        self.row_count = 0
+        self.total_weight = 0
+        self._lines = []
+        self._first_member_id = None
+        self._last_member_id = None
+
+    def add(self, member_id, email, weight, votes):
+        line = submission_line(member_id, email, weight, votes)
+        self.hasher.update(line)
+        self._lines.append(line)
+        if self._first_member_id is None:
+            self._first_member_id = member_id
+        self._last_member_id = member_id
+        self.row_count += 1
+        self.total_weight += weight
+        if len(self._lines) >= self.chunk_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._lines:
+            return
+        self.chunks.append({
+            'sequence': len(self.chunks),
+            'first_member_id': self._first_member_id,
+            'last_member_id': self._last_member_id,
+            'row_count': len(self._lines),
+            'data': compress(b''.join(self._lines), self.encoding),
+        })
+        self._lines = []
+        self._first_member_id = None
+
+    def finish(self):
+        """
+        Flush the last chunk and return the hex content hash.
+        """
+        self._flush()
+        return self.hasher.hexdigest()
+
+    @property
+    def compressed_size(self):
+        return sum(len(chunk['data']) for chunk in self.chunks)
+
+
+def store_artifact(builder, artifact_model, chunk_model):
+    """
+    Return the artifact for the builder's content, creating it only if no artifact with the same
+    content hash exists yet. Returns (artifact, created). Model classes are passed in so data
+    migrations can use their historical models.
+    """
+    content_hash = builder.finish()
+    artifact = artifact_model.objects.filter(content_hash=content_hash).first()
+    if artifact is not None:
+        return artifact, False
+
+    try:
+        with transaction.atomic():
+            artifact = artifact_model.objects.create(
+                content_hash=content_hash,
+                encoding=builder.encoding,
+                row_count=builder.row_count,
+                compressed_size=builder.compressed_size
+            )
+            chunk_model.objects.bulk_create(
+                [chunk_model(artifact=artifact, **chunk) for chunk in builder.chunks],
+                batch_size=100
+            )
+    except IntegrityError:
+        # The same report was stored concurrently; use that artifact
+        return artifact_model.objects.get(content_hash=content_hash), False
+    return artifact, True
+
+
+def iter_chunk_rows(chunk, encoding):
+    """
+    Decode the submissions stored in one chunk, as dicts in member id order.
+    """
+    for line in decompress(chunk.data, encoding).splitlines():
+        yield json.loads(line)
+
+
+def iter_artifact_rows(artifact, after_member_id=None):
+    """
+    Stream the submissions of an artifact chunk by chunk, optionally starting after a member id.
+    Each chunk is fetched with its own keyset query on sequence, so only one compressed and one
+    decompressed chunk are held in memory at a time even where the driver would fetch a whole
+    result set at once (no server-side cursors on SQLite or behind pgbouncer).
+    """
+    if artifact is None:
+        return
+    chunks = artifact.chunks.order_by('sequence')
+    if after_member_id is not None:
+        chunks = chunks.filter(last_member_id__gt=after_member_id)
+    sequence = None
+    while True:
+        chunk = (chunks if sequence is None else chunks.filter(sequence__gt=sequence)).first()
+        if chunk is None:
+            return
+        sequence = chunk.sequence
+        for row in iter_chunk_rows(chunk, artifact.encoding):
+            if after_member_id is None or row['member_id'] > after_member_id:
+                yield row
+
+
+def artifact_page(artifact, after_member_id=None, limit=100):
+    """
+    One page of submissions for keyset pagination over member id: (rows, next_after_member_id),
+    where next_after_member_id is None on the last page. Only the chunks overlapping the page are
+    read, so the cost of a page does not depend on the size of the report or on its position.
+    """
+    rows = []
+    for row in iter_artifact_rows(artifact, after_member_id=after_member_id):
+        if len(rows) == limit:
+            return rows, rows[-1]['member_id']
+        rows.append(row)
+    return rows, None
@@ -0,0 +1,103 @@
+"""
+Async (ASGI-native) versions of the voter endpoints.
+
+They behave exactly like the views in ballot.views but use the async ORM, so an ASGI worker can
+keep many voters in flight while they wait on the database. They are routed instead of the sync
+views when BALLOT_ASYNC_VIEWS is enabled; serve them with an ASGI server, e.g.
+
+    gunicorn -k uvicorn_worker.UvicornWorker asgi:application
+
+Under WSGI they still work, but every request pays for an event loop round trip.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.http import Http404
+from django.shortcuts import redirect, render
+
+from . import token_cache
+from .caching import aget_ballot_definition
+from .instrumentation import tag_view
+from .loaders import aload_invitation
+from .models import VotingEvent
+from .submissions import AlreadyVoted, record_vote
+from .views import _ballot_access_response, _collect_submission_data
+
+
+async def _aload_ballot(token):
+    """Return (invitation, None) for a voter who may see the ballot, or (invitation or None, response) otherwise"""
+    # Already used and unknown tokens are answered from the token cache without a query
+    cached = await token_cache.aget(token)
+    if isinstance(cached, token_cache.TokenEntry) and cached.used:
+        return None, redirect('ballot:already_voted')
+
+    # Get the invitation with its event, member and access checks in one query
+    invitation = await aload_invitation(token, cached)
+    return invitation, _ballot_access_response(invitation)
+
+
+@tag_view('ballot.vote_view')
+async def vote_view(request, token):
+    """Display the voting form for a member with a valid token"""
+    invitation, denied = await _aload_ballot(token)
+    if denied:
+        return denied
+
+    # Questions come from the per-event ballot cache, only token and CSRF are rendered per request
+    ballot_definition = await aget_ballot_definition(invitation.voting_event)
+
+    context = {
+        'voting_event': invitation.voting_event,
+        'member': invitation.member,
+        'votes': ballot_definition['votes'],
+        'votes_html': ballot_definition['html'],
+        'token': token,
+    }
+
+    return render(request, 'ballot/vote_form.html', context)
+
+
+@tag_view('ballot.submit_vote')
+async def submit_vote(request, token):
+    """Handle vote submission"""
+    if request.method != 'POST':
+        return redirect('ballot:vote', token=token)
+
+    invitation, denied = await _aload_ballot(token)
+    if denied:
+        return denied
+
+    voting_event = invitation.voting_event
+
+    # Collect submission data from form
+    ballot_definition = await aget_ballot_definition(voting_event)
+    submission_data = _collect_submission_data(request, ballot_definition['votes'])
+
+    # Transactions are not available in the async ORM, so the atomic unit runs in a worker thread
+    try:
+        await sync_to_async(record_vote)(invitation, submission_data, token=token)
+    except AlreadyVoted:
+        return redirect('ballot:already_voted')
+
+    messages.success(request, 'Your vote has been submitted successfully!')
+    return redirect('ballot:vote_success', voting_event_id=voting_event.id)
+
+
+@tag_view('ballot.vote_closed')
+async def vote_closed(request):
+    """Display message when voting is closed"""
+    return render(request, 'ballot/vote_closed.html')
+
+
+@tag_view('ballot.already_voted')
+async def already_voted(request):
+    """Display message when member has already voted"""
+    return render(request, 'ballot/already_voted.html')
+
+
+@tag_view('ballot.vote_success')
+async def vote_success(request, voting_event_id):
+    """Display success message after voting"""
+    voting_event = await VotingEvent.objects.filter(pk=voting_event_id).afirst()
+    if voting_event is None:
+        raise Http404("No VotingEvent matches the given query.")
+    return render(request, 'ballot/vote_success.html', {'voting_event': voting_event})
@@ -0,0 +1,357 @@
+import http.client
+import os
+import queue
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+
+from .invitations import create_invitations
+from .middleware import QUERY_COUNT_HEADER
+from .models import Member, Vote, VotingEvent
+
+
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+# queries is the X-Query-Count header of the response, None when the server doesn't send it
+RequestSample = namedtuple('RequestSample', ['name', 'status', 'latency', 'ok', 'queries'], defaults=(None,))
+
+
+class LoadResult:
+    """
+    Samples collected by a load run, with throughput and latency percentile helpers.
+    """
+
+    def __init__(self, samples, elapsed):
+        self.samples = samples
+        self.elapsed = elapsed
+
+    @property
+    def requests(self):
+        return len(self.samples)
+
+    @property
+    def errors(self):
+        return sum(not sample.ok for sample in self.samples)
+
+    @property
+    def rps(self):
+        return self.requests / self.elapsed if self.elapsed else 0
+
+    def percentile(self, percent, name=None):
+        """
+        Nearest-rank latency percentile in milliseconds, optionally for one request name only.
+        """
+        latencies = sorted(sample.latency for sample in self.samples if name is None or sample.name == name)
+        if not latencies:
+            return 0
+        index = max(0, min(len(latencies) - 1, int(round(percent / 100 * len(latencies))) - 1))
+        return latencies[index] * 1000
+
+    def names(self):
+        return sorted({sample.name for sample in self.samples})
+
+    def count(self, name=None):
+        return sum(name is None or sample.name == name for sample in self.samples)
+
+    def error_count(self, name=None):
+        return sum(not sample.ok for sample in self.samples if name is None or sample.name == name)
+
+    def queries(self, name=None):
+        """
+        (mean, max) query count per request from the X-Query-Count headers, or (None, None)
+        when the server didn't report them.
+        """
+        counts = [
+            sample.queries for sample in self.samples
+            if sample.queries is not None and (name is None or sample.name == name)
+        ]
+        if not counts:
+            return None, None
+        return sum(counts) / len(counts), max(counts)
+
+    def summary(self):
+        """
+        Figures of the whole run and of every request name, as a JSON serializable dict.
+        """
+        def figures(name=None):
+            mean_queries, max_queries = self.queries(name)
+            count = self.count(name)
+            return {
+                'requests': count,
+                'errors': self.error_count(name),
+                'error_rate': self.error_count(name) / count if count else 0,
+                'p50': self.percentile(50, name),
+                'p90': self.percentile(90, name),
+                'p95': self.percentile(95, name),
+                'p99': self.percentile(99, name),
+                'mean_queries': mean_queries,
+                'max_queries': max_queries,
+            }
+
+        return dict(figures(), rps=self.rps, elapsed=self.elapsed, names={name: figures(name) for name in self.names()})
+
+
+class HTTPSession:
+    """
+    A keep-alive HTTP connection with a cookie jar, as used by one simulated voter thread.
+    """
+
+    def __init__(self, host, port, recorder, timeout=30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.recorder = recorder
+        self.cookies = SimpleCookie()
+        self.connection = None
+
+    def request(self, name, method, path, data=None, expect=(200,)):
+        """
+        Send a request and record its latency. Returns (status, headers, body) or None on a
+        connection error, which is recorded as a failed sample.
+        """
+        headers = {'Host': f'{self.host}:{self.port}'}
+        body = None
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{key}={morsel.value}' for key, morsel in self.cookies.items())
+        if data is not None:
+            body = urlencode(data)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            headers['Referer'] = f'http://{self.host}:{self.port}{path}'
+
+        started = time.perf_counter()
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            self.recorder.append(RequestSample(name, 0, time.perf_counter() - started, False))
+            return None
+
+        latency = time.perf_counter() - started
+        for cookie in response.headers.get_all('Set-Cookie') or []:
+            self.cookies.load(cookie)
+        queries = response.headers.get(QUERY_COUNT_HEADER)
+        self.recorder.append(RequestSample(
+            name, response.status, latency, response.status in expect, int(queries) if queries else None
+        ))
+        return response.status, response.headers, content.decode('utf-8', 'replace')
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def view_ballot(session, token, answers):
+    """
+    Scenario: open the voting form.
+    """
+    session.request('vote_view', 'GET', reverse('ballot:vote', args=[token]))
+
+
+def cast_vote(session, token, answers):
+    """
+    Scenario: open the voting form and submit it, like a real voter.
+    """
+    response = session.request('vote_view', 'GET', reverse('ballot:vote', args=[token]))
+    if response is None:
+        return
+    match = CSRF_INPUT_RE.search(response[2])
+    if match is None:
+        return
+    data = dict(answers, csrfmiddlewaretoken=match.group(1))
+    session.request('submit_vote', 'POST', reverse('ballot:submit_vote', args=[token]), data=data, expect=(302,))
+
+
+def run_load(host, port, scenario, tokens, answers, concurrency, ramp_up=0):
+    """
+    Run a scenario once per token with `concurrency` voter threads, each holding a keep-alive
+    connection, and return the LoadResult. The threads are started evenly over ramp_up seconds;
+    with the default of 0 they all start at once, like voters arriving when an election opens.
+    """
+    work = queue.Queue()
+    for token in tokens:
+        work.put(token)
+
+    samples = []
+    lock = threading.Lock()
+
+    def voter():
+        recorded = []
+        session = HTTPSession(host, port, recorded)
+        while True:
+            try:
+                token = work.get_nowait()
+            except queue.Empty:
+                break
+            session.cookies = SimpleCookie()
+            scenario(session, token, answers)
+        session.close()
+        with lock:
+            samples.extend(recorded)
+
+    threads = [threading.Thread(target=voter) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for index, thread in enumerate(threads):
+        if ramp_up and index:
+            time.sleep(ramp_up / concurrency)
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return LoadResult(samples, time.perf_counter() - started)
+
+
+def seed_voting_event(member_count, title='Benchmark Assembly'):
+    """
+    Create an open voting event with one vote of each type, member_count members and their
+    invitations. No invitation emails are queued, as the members' addresses are made up.
+    Returns (voting_event, tokens, answers) where answers is valid form data.
+    """
+    voting_event = VotingEvent.objects.create(title=title, state='open')
+    votes = [
+        Vote.objects.create(voting_event=voting_event, title='Approve the budget', vote_type='simple'),
+        Vote.objects.create(
+            voting_event=voting_event,
+            title='Nominate a board member',
+            vote_type='short_text',
+            type_specific_data={'default_value': ''}
+        ),
+        Vote.objects.create(
+            voting_event=voting_event,
+            title='Choose the venue',
+            vote_type='radio',
+            type_specific_data={'options': ['Zurich', 'Berlin', 'Lisbon']}
+        ),
+    ]
+
+    prefix = f'bench-{voting_event.pk}'
+    Member.objects.bulk_create(
+        [
+            Member(name=f'Member {i}', email=f'{prefix}-{i}@example.org', membership_weight=1 + i % 5)
+            for i in range(member_count)
+        ],
+        batch_size=1000
+    )
+    member_ids = Member.objects.filter(email__startswith=f'{prefix}-').values_list('id', flat=True)
+    VotingEvent.members.through.objects.bulk_create(
+        [VotingEvent.members.through(votingevent_id=voting_event.pk, member_id=member_id) for member_id in member_ids],
+        batch_size=1000
+    )
+    create_invitations(voting_event, send_emails=False)
+
+    tokens = [str(secret) for secret in voting_event.invitations.values_list('secret', flat=True)]
+    answers = {
+        f'vote_{votes[0].id}': 'agree',
+        f'vote_{votes[1].id}': 'Grace Hopper',
+        f'vote_{votes[2].id}': 'Zurich',
+    }
+    return voting_event, tokens, answers
+
+
+def delete_seeded_event(voting_event):
+    """
+    Delete a voting event created by seed_voting_event() with its members; votes, invitations,
+    submissions and tallies go with them.
+    """
+    with transaction.atomic():
+        Member.objects.filter(email__startswith=f'bench-{voting_event.pk}-').delete()
+        voting_event.delete()
+
+
+@contextmanager
+def seeded_voting_event(member_count, title='Benchmark Assembly', keep=False):
+    """
+    seed_voting_event() for the duration of a `with` block, which deletes the seeded data again
+    on the way out unless keep is set, so benchmarks don't leave fake members in the database.
+    """
+    voting_event, tokens, answers = seed_voting_event(member_count, title=title)
+    try:
+        yield voting_event, tokens, answers
+    finally:
+        if not keep:
+            delete_seeded_event(voting_event)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ServerProcess:
+    """
+    Runs the project under gunicorn in a subprocess for the duration of a `with` block.
+    mode is 'wsgi' (sync workers) or 'asgi' (uvicorn workers serving the async views).
+    """
+
+    def __init__(self, mode='wsgi', workers=2, threads=1, port=None, env=None, extra_args=()):
+        self.mode = mode
+        self.workers = workers
+        self.threads = threads
+        self.port = port or free_port()
+        self.env = env or {}
+        self.extra_args = list(extra_args)
+        self.process = None
+
+    def command(self):
+        command = [
+            sys.executable, '-m', 'gunicorn',
+            '--bind', f'127.0.0.1:{self.port}',
+            '--workers', str(self.workers),
+            '--log-level', 'warning',
+        ]
+        if self.mode == 'asgi':
+            command += ['--worker-class', 'uvicorn_worker.UvicornWorker', 'asgi:application']
+        else:
+            command += ['--threads', str(self.threads), 'wsgi:application']
+        return command[:-1] + self.extra_args + command[-1:]
+
+    def __enter__(self):
+        env = dict(os.environ, DEBUG='False', BALLOT_ASYNC_VIEWS=str(self.mode == 'asgi'), **self.env)
+        self.process = subprocess.Popen(self.command(), cwd=settings.BASE_DIR, env=env)
+        self._wait_until_ready()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def _wait_until_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError("Server did not start in time")
+
+
+def format_result(label, result):
+    """
+    One line summary of a LoadResult for command output.
+    """
+    return (
+        f"{label:<24} {result.requests:>7} req {result.errors:>5} err {result.rps:>9.1f} req/s "
+        f"p50 {result.percentile(50):>7.1f}ms p99 {result.percentile(99):>7.1f}ms"
+    )
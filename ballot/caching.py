@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import VotingEvent
+
+
+BALLOT_DEFINITION_TIMEOUT = 60 * 60
+
+
+def get_cache():
+    return caches[settings.BALLOT_CACHE_ALIAS]
+
+
+def ballot_definition_key(voting_event):
+    """
+    Cache key of the compiled ballot of a voting event.
+    The event's updated_at acts as the version: any edit of the event or of one of its votes moves
+    it forward, so every process picks up the new ballot on its next request, even with a
+    per-process local-memory cache that a signal in another process could never clear.
+    """
+    return f'ballot:definition:{voting_event.pk}:{voting_event.updated_at.timestamp():.6f}'
+
+
+def get_ballot_definition(voting_event):
+    """
+    Return the compiled ballot of a voting event: {'votes': [...], 'html': ...}.
+    'votes' holds the ordered Vote objects with their type_specific_data, 'html' the rendered
+    question markup when BALLOT_CACHE_RENDERED_BALLOT is enabled (None otherwise). The fragment
+    contains no token or CSRF data, so it is identical for every voter of the event.
+    """
+    cache = get_cache()
+    key = ballot_definition_key(voting_event)
+
+    definition = cache.get(key)
+    if definition is None:
+        votes = list(voting_event.votes.all())
+        definition = {'votes': votes, 'html': None}
+        if settings.BALLOT_CACHE_RENDERED_BALLOT:
+            definition['html'] = render_to_string('ballot/_vote_items.html', {'votes': votes})
+        cache.set(key, definition, BALLOT_DEFINITION_TIMEOUT)
+
+    return definition
+
+
+async def aget_ballot_definition(voting_event):
+    """
+    Async counterpart of get_ballot_definition.
+    """
+    cache = get_cache()
+    key = ballot_definition_key(voting_event)
+
+    definition = await cache.aget(key)
+    if definition is None:
+        votes = [vote async for vote in voting_event.votes.all()]
+        definition = {'votes': votes, 'html': None}
+        if settings.BALLOT_CACHE_RENDERED_BALLOT:
+            definition['html'] = render_to_string('ballot/_vote_items.html', {'votes': votes})
+        await cache.aset(key, definition, BALLOT_DEFINITION_TIMEOUT)
+
+    return definition
+
+
+def invalidate_ballot_definition(voting_event_id):
+    """
+    Move the ballot version of a voting event forward so cached definitions are no longer used.
+    Uses a queryset update, so it neither fires signals nor touches other fields of the event.
+    """
+    VotingEvent.objects.filter(pk=voting_event_id).update(updated_at=timezone.now())
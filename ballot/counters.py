@@ -0,0 +1,45 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Submission, Vote, VotingEvent
+
+
+def _count_subquery(queryset, event_field):
+    """
+    Correlated COUNT(*) over `queryset` for the voting event of the outer row, 0 when empty.
+    """
+    counted = queryset.filter(**{event_field: OuterRef('pk')}).order_by().values(event_field).annotate(
+        total=Count('*')
+    ).values('total')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def count_annotations():
+    """
+    Annotations for the number of members, votes and submissions of each voting event.
+    Each count is a separate correlated subquery, which avoids the row multiplication of joining
+    three to-many relations and lets a whole changelist page be counted in a single query.
+    """
+    return {
+        '_member_count': _count_subquery(VotingEvent.members.through.objects.all(), 'votingevent_id'),
+        '_vote_count': _count_subquery(Vote.objects.all(), 'voting_event_id'),
+        '_submission_count': _count_subquery(Submission.objects.all(), 'voting_event_id'),
+    }
+
+
+def refresh_event_totals(queryset=None):
+    """
+    Store the current member, vote and submission counts in the precomputed counter columns
+    of the given voting events (all events by default), with a single UPDATE statement.
+    Returns the number of events refreshed.
+    """
+    if queryset is None:
+        queryset = VotingEvent.objects.all()
+    annotations = count_annotations()
+    return queryset.update(
+        member_total=annotations['_member_count'],
+        vote_total=annotations['_vote_count'],
+        submission_total=annotations['_submission_count'],
+        totals_updated_at=timezone.now()
+    )
@@ -0,0 +1,175 @@
+import logging
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .mailers import TemporaryDeliveryError, get_mailer
+from .models import InvitationEmail, VotingEventInvitation
+
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_BATCH_SIZE = 100
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# How long a claimed message is hidden from other workers; if a worker dies mid-batch,
+# its messages become due again once the lease runs out.
+CLAIM_LEASE_SECONDS = 300
+
+DispatchResult = namedtuple('DispatchResult', ['sent', 'retried', 'failed'])
+
+
+def enqueue_invitation_emails(voting_event, created_since=None):
+    """
+    Add an outbox entry for every unused invitation of the voting event that doesn't have one yet,
+    or only for those created since created_since. Uses one anti-join query and a bulk insert, so it
+    can run inside the invitation transaction. Returns the number of queued emails.
+    """
+    invitations = VotingEventInvitation.objects.filter(voting_event=voting_event, used_at__isnull=True)
+    if created_since is not None:
+        invitations = invitations.filter(created_at__gte=created_since)
+    invitation_ids = list(
+        invitations.filter(
+            ~Exists(InvitationEmail.objects.filter(invitation=OuterRef('pk')))
+        ).values_list('id', flat=True)
+    )
+    InvitationEmail.objects.bulk_create(
+        [InvitationEmail(invitation_id=invitation_id) for invitation_id in invitation_ids],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+    return len(invitation_ids)
+
+
+def claim_batch(batch_size=DISPATCH_BATCH_SIZE):
+    """
+    Claim up to batch_size due outbox entries for this worker.
+    The rows are locked with SKIP LOCKED where supported, so several workers can drain the
+    outbox in parallel, and their next attempt is pushed past the claim lease before the lock
+    is released.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            InvitationEmail.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                state='pending',
+                next_attempt_at__lte=now
+            ).select_related('invitation__member', 'invitation__voting_event').order_by('next_attempt_at')[:batch_size]
+        )
+        InvitationEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+        )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def build_message(email):
+    """
+    Render the invitation email for an outbox entry.
+    """
+    invitation = email.invitation
+    context = {
+        'member': invitation.member,
+        'voting_event': invitation.voting_event,
+        'voting_url': settings.BALLOT_BASE_URL.rstrip('/') + reverse('ballot:vote', args=[invitation.secret]),
+    }
+    return {
+        'to': invitation.member.email,
+        'name': invitation.member.name,
+        'subject': render_to_string('ballot/email/invitation_subject.txt', context).strip(),
+        'body': render_to_string('ballot/email/invitation.txt', context),
+    }
+
+
+def backoff_delay(attempts):
+    """
+    Exponential backoff in seconds after the given number of failed attempts.
+    """
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+class RateLimiter:
+    """
+    Spaces calls evenly so that no more than `rate` messages are sent per second.
+    A rate of 0 disables throttling.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_slot > now:
+            time.sleep(self.next_slot - now)
+        self.next_slot = max(self.next_slot, now) + self.interval
+
+
+def send_batch(mailer, emails, rate_limiter, max_attempts=MAX_ATTEMPTS):
+    """
+    Send a batch of claimed outbox entries through an open mailer and record the outcome.
+    Temporary failures are rescheduled with exponential backoff until max_attempts is reached;
+    permanent failures are marked failed straight away.
+    """
+    sent = retried = failed = 0
+
+    for email in emails:
+        rate_limiter.wait()
+        try:
+            mailer.send(build_message(email))
+        except TemporaryDeliveryError as exc:
+            if email.attempts >= max_attempts:
+                _mark_failed(email, exc)
+                failed += 1
+            else:
+                InvitationEmail.objects.filter(pk=email.pk).update(
+                    next_attempt_at=timezone.now() + timedelta(seconds=backoff_delay(email.attempts)),
+                    last_error=str(exc)
+                )
+                retried += 1
+        except Exception as exc:
+            logger.exception("Permanent failure sending invitation email %s", email.pk)
+            _mark_failed(email, exc)
+            failed += 1
+        else:
+            InvitationEmail.objects.filter(pk=email.pk).update(state='sent', sent_at=timezone.now(), last_error='')
+            sent += 1
+
+    return DispatchResult(sent=sent, retried=retried, failed=failed)
+
+
+def _mark_failed(email, exc):
+    InvitationEmail.objects.filter(pk=email.pk).update(state='failed', last_error=str(exc))
+
+
+def dispatch_pending(batch_size=DISPATCH_BATCH_SIZE, rate=0, max_attempts=MAX_ATTEMPTS, mailer=None):
+    """
+    Drain every currently due outbox entry in batches, reusing one mailer connection.
+    Returns a DispatchResult with the totals over all batches.
+    """
+    mailer = mailer or get_mailer()
+    rate_limiter = RateLimiter(rate)
+    totals = DispatchResult(0, 0, 0)
+
+    with mailer:
+        while True:
+            emails = claim_batch(batch_size)
+            if not emails:
+                break
+            result = send_batch(mailer, emails, rate_limiter, max_attempts)
+            totals = DispatchResult(*(total + count for total, count in zip(totals, result)))
+
+    return totals
@@ -0,0 +1,190 @@
+import csv
+import json
+import struct
+import sys
+from array import array
+
+from django.http import StreamingHttpResponse
+
+from .artifacts import iter_artifact_rows
+from .reports import iter_submission_rows
+from .routers import keep_routing
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'columnar': ('application/octet-stream', 'ballotc'),
+}
+
+# Columnar format: magic, row groups, a zero row count, JSON footer, footer length, magic
+COLUMNAR_MAGIC = b'BALLOTC1'
+COLUMNAR_ROW_GROUP_SIZE = 10000
+
+# Leading characters that make spreadsheet applications evaluate a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer that hands every written line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def event_export_source(voting_event):
+    """
+    (votes, rows) for a live voting event: the votes of the event and its submissions streamed
+    in member id order from a server-side cursor.
+    """
+    votes = [
+        {'id': str(vote_id), 'title': title, 'type': vote_type}
+        for vote_id, title, vote_type in voting_event.votes.values_list('id', 'title', 'vote_type')
+    ]
+    return votes, iter_submission_rows(voting_event, order_by='member_id')
+
+
+def report_export_source(report):
+    """
+    (votes, rows) for the submissions captured in a voting report, decompressed from its
+    artifact one chunk at a time.
+    """
+    data = report.summary_data
+    votes = [{'id': vote['id'], 'title': vote['title'], 'type': vote['type']} for vote in data.get('votes', [])]
+    rows = (
+        (submission['member_id'], submission['member_email'], submission['weight'], submission['votes'])
+        for submission in iter_artifact_rows(report.artifact)
+    )
+    return votes, rows
+
+
+def _csv_cell(value):
+    # Quote free text that a spreadsheet would otherwise run as a formula (CSV injection)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(votes, rows):
+    """
+    CSV lines: member columns followed by one column per vote. Text cells starting with =, +, -,
+    @, a tab or a carriage return are prefixed with ' so spreadsheets show them as text.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(
+        ['member_id', 'member_email', 'weight'] + [_csv_cell(f"{vote['id']}: {vote['title']}") for vote in votes]
+    )
+    for member_id, email, weight, answers in rows:
+        yield writer.writerow(
+            [member_id, _csv_cell(email), weight] + [_csv_cell(answers.get(vote['id'], '')) for vote in votes]
+        )
+
+
+def iter_ndjson(votes, rows):
+    """
+    One JSON object per submission and line.
+    """
+    for member_id, email, weight, answers in rows:
+        yield json.dumps({
+            'member_id': member_id,
+            'member_email': email,
+            'weight': weight,
+            'votes': answers,
+        }) + '\n'
+
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def iter_columnar(votes, rows, row_group_size=COLUMNAR_ROW_GROUP_SIZE):
+    """
+    Compact columnar binary export of (member_id, weight, answer codes) for offline analysis.
+    Rows are written in row groups: a uint32 row count followed by an int64 member id column, a
+    uint32 weight column and one uint32 answer code column per vote, all little-endian. Answers
+    are dictionary encoded per vote; the dictionaries, in code order, and the vote list are stored
+    in a JSON footer once all rows are written, so memory is bounded by one row group plus the
+    dictionaries. Email addresses are left out on purpose. Read it back with read_columnar().
+    """
+    dictionaries = [{} for _ in votes]
+    vote_ids = [vote['id'] for vote in votes]
+
+    def row_group(group):
+        columns = [
+            array('q', [row[0] for row in group]),
+            array('I', [row[2] for row in group]),
+        ]
+        for position, vote_id in enumerate(vote_ids):
+            dictionary = dictionaries[position]
+            codes = array('I')
+            for row in group:
+                answer = row[3].get(vote_id, '')
+                codes.append(dictionary.setdefault(answer, len(dictionary)))
+            columns.append(codes)
+        return struct.pack('<I', len(group)) + b''.join(_little_endian(column) for column in columns)
+
+    yield COLUMNAR_MAGIC
+    group = []
+    for row in rows:
+        group.append(row)
+        if len(group) >= row_group_size:
+            yield row_group(group)
+            group = []
+    if group:
+        yield row_group(group)
+    yield struct.pack('<I', 0)
+
+    footer = json.dumps({
+        'votes': [
+            dict(vote, dictionary=list(dictionary))
+            for vote, dictionary in zip(votes, dictionaries)
+        ],
+    }).encode()
+    yield footer + struct.pack('<I', len(footer)) + COLUMNAR_MAGIC
+
+
+def read_columnar(fileobj):
+    """
+    Read a columnar export back into {'member_id': array, 'weight': array, 'votes': [...],
+    '<vote_id>': array of answer codes}. Decode codes with each vote's 'dictionary'.
+    """
+    data = fileobj.read()
+    if data[:8] != COLUMNAR_MAGIC or data[-8:] != COLUMNAR_MAGIC:
+        raise ValueError("Not a ballot columnar export")
+    footer_length = struct.unpack('<I', data[-12:-8])[0]
+    footer = json.loads(data[-12 - footer_length:-12])
+    vote_ids = [vote['id'] for vote in footer['votes']]
+
+    columns = {'member_id': array('q'), 'weight': array('I')}
+    columns.update({vote_id: array('I') for vote_id in vote_ids})
+    offset = 8
+    while True:
+        row_count = struct.unpack_from('<I', data, offset)[0]
+        offset += 4
+        if not row_count:
+            break
+        for name in ['member_id', 'weight'] + vote_ids:
+            column = array(columns[name].typecode)
+            size = row_count * column.itemsize
+            column.frombytes(data[offset:offset + size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns[name].extend(column)
+            offset += size
+
+    columns['votes'] = footer['votes']
+    return columns
+
+
+def streaming_export_response(votes, rows, export_format, filename):
+    """
+    StreamingHttpResponse for an export, so memory stays constant however many rows are written.
+    """
+    content_type, extension = EXPORT_FORMATS[export_format]
+    writers = {'csv': iter_csv, 'ndjson': iter_ndjson, 'columnar': iter_columnar}
+    # The rows are read while the response is sent, after the view has returned
+    response = StreamingHttpResponse(writers[export_format](votes, keep_routing(rows)), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
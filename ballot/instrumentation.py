@@ -0,0 +1,169 @@
+"""
+Per-request performance instrumentation, recorded by ballot.middleware.InstrumentationMiddleware
+when BALLOT_INSTRUMENTATION is enabled.
+
+Every request is measured for wall time, SQL query count and time (through
+connection.execute_wrapper), template render time (through the InstrumentedDjangoTemplates
+backend) and response size. The figures go into the histograms of ballot.metrics, labelled with
+the view's tag: the name given with tag_view() or tag_request(), else the URL name of the view.
+Requests slower than BALLOT_SLOW_REQUEST_MS are logged with their slowest queries.
+"""
+import contextvars
+import heapq
+import logging
+import time
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import QUERY_BUCKETS, SIZE_BUCKETS, Counter, Histogram, registry
+
+logger = logging.getLogger(__name__)
+
+# Tag of requests that didn't resolve to a view, so that 404 scans don't create label values
+UNRESOLVED_TAG = 'unresolved'
+
+REQUESTS = registry.register(Counter(
+    'ballot_requests_total', 'Requests by view and status class.', ['view', 'status']
+))
+REQUEST_DURATION = registry.register(Histogram(
+    'ballot_request_duration_seconds', 'Wall time of requests.', ['view']
+))
+DB_QUERIES = registry.register(Histogram(
+    'ballot_request_db_queries', 'SQL queries per request.', ['view'], buckets=QUERY_BUCKETS
+))
+DB_DURATION = registry.register(Histogram(
+    'ballot_request_db_duration_seconds', 'Time spent in SQL queries per request.', ['view']
+))
+TEMPLATE_DURATION = registry.register(Histogram(
+    'ballot_request_template_duration_seconds', 'Time spent rendering templates per request.', ['view']
+))
+RESPONSE_SIZE = registry.register(Histogram(
+    'ballot_response_size_bytes', 'Size of non-streaming response bodies.', ['view'], buckets=SIZE_BUCKETS
+))
+
+_current = contextvars.ContextVar('ballot_request_record', default=None)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def tag_view(tag):
+    """
+    Decorator naming the metrics label of a view, e.g. @tag_view('ballot.vote'). The tag survives
+    wrapping by other decorators and admin_view(), which copy function attributes.
+    """
+    def decorator(view):
+        view.instrumentation_tag = tag
+        return view
+    return decorator
+
+
+def tag_request(request, tag):
+    """
+    Name the metrics label of the current request from inside a view, e.g. for admin actions that
+    run within the change or changelist view.
+    """
+    request.instrumentation_tag = tag
+
+
+class RequestRecord:
+    """
+    Figures of one request. Doubles as the execute_wrapper hook that times its queries.
+    """
+
+    def __init__(self, top_queries=5):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.top_queries = top_queries
+        self.slowest = []  # min-heap of (duration, sequence, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += duration
+            entry = (duration, self.queries, sql)
+            if len(self.slowest) < self.top_queries:
+                heapq.heappush(self.slowest, entry)
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def slowest_queries(self):
+        return [(duration, sql) for duration, _, sql in sorted(self.slowest, reverse=True)]
+
+
+def activate(record):
+    return _current.set(record)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def request_tag(request):
+    tag = getattr(request, 'instrumentation_tag', None)
+    if tag:
+        return tag
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else UNRESOLVED_TAG
+
+
+def observe(request, response, record, elapsed):
+    """
+    Put the figures of a finished request into the metrics and log it if it was slow.
+    """
+    tag = request_tag(request)
+    REQUESTS.inc(tag, f'{response.status_code // 100}xx')
+    REQUEST_DURATION.observe(elapsed, tag)
+    DB_QUERIES.observe(record.queries, tag)
+    DB_DURATION.observe(record.db_time, tag)
+    TEMPLATE_DURATION.observe(record.template_time, tag)
+    size = None if response.streaming else len(response.content)
+    if size is not None:
+        RESPONSE_SIZE.observe(size, tag)
+
+    if elapsed * 1000 >= _setting('BALLOT_SLOW_REQUEST_MS', 500):
+        logger.warning(
+            "Slow request %s %s (%s): %.0fms, %d queries in %.0fms, templates %.0fms, %s bytes%s",
+            request.method, request.path, tag, elapsed * 1000, record.queries, record.db_time * 1000,
+            record.template_time * 1000, 'streamed' if size is None else size,
+            ''.join(f'\n  {duration * 1000:.1f}ms {sql}' for duration, sql in record.slowest_queries())
+        )
+
+
+class TimedTemplate(Template):
+    """
+    Django template that adds its render time to the current request record. Templates rendered
+    while another one renders (e.g. from a template tag) are part of the outer time.
+    """
+
+    def render(self, context=None, request=None):
+        record = _current.get()
+        if record is None or record.template_depth:
+            return super().render(context, request)
+        record.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record.template_time += time.perf_counter() - started
+            record.template_depth -= 1
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, with render times recorded for the instrumentation.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
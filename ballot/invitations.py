@@ -0,0 +1,74 @@
+import time
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .dispatch import enqueue_invitation_emails
+from .models import Member, VotingEvent, VotingEventInvitation
+
+
+INVITATION_BATCH_SIZE = 1000
+
+InvitationResult = namedtuple('InvitationResult', ['created', 'existing', 'queued', 'opened', 'elapsed'])
+
+
+def create_invitations(
+    voting_event, batch_size=INVITATION_BATCH_SIZE, open_event=True, email_existing=False, send_emails=True
+):
+    """
+    Create the missing invitations for all members of a voting event and optionally open it.
+    The members still lacking an invitation are found with a single anti-join query and inserted
+    with bulk_create in batches. Everything runs in one transaction holding a lock on the event
+    row, so a crash never leaves a half-invited roll behind and two admins clicking at the same
+    time don't race each other. Emails for the new invitations are queued in the outbox in the same
+    transaction and sent later by the dispatch_invitation_emails worker; with email_existing, older
+    unused invitations that were never emailed (e.g. created before the outbox) are queued too.
+    Without send_emails nothing is queued, e.g. for the fake members of a load test.
+    Returns an InvitationResult with row counts and elapsed seconds.
+    """
+    started = time.monotonic()
+
+    with transaction.atomic():
+        locked_event = VotingEvent.objects.select_for_update().get(pk=voting_event.pk)
+        locked_at = timezone.now()
+
+        missing_member_ids = list(
+            Member.objects.filter(voting_events=locked_event).filter(
+                ~Exists(VotingEventInvitation.objects.filter(voting_event=locked_event, member=OuterRef('pk')))
+            ).values_list('id', flat=True)
+        )
+
+        for offset in range(0, len(missing_member_ids), batch_size):
+            VotingEventInvitation.objects.bulk_create(
+                [
+                    VotingEventInvitation(voting_event=locked_event, member_id=member_id)
+                    for member_id in missing_member_ids[offset:offset + batch_size]
+                ],
+                ignore_conflicts=True
+            )
+
+        queued = 0
+        if send_emails:
+            queued = enqueue_invitation_emails(locked_event, created_since=None if email_existing else locked_at)
+
+        # Rows another transaction inserted in the meantime were skipped by ignore_conflicts
+        created = VotingEventInvitation.objects.filter(voting_event=locked_event, created_at__gte=locked_at).count()
+
+        opened = False
+        if open_event and locked_event.state != 'open':
+            locked_event.state = 'open'
+            locked_event.save(update_fields=['state', 'updated_at'])
+            opened = True
+        voting_event.state = locked_event.state
+
+        existing = VotingEventInvitation.objects.filter(voting_event=locked_event).count() - created
+
+    return InvitationResult(
+        created=created,
+        existing=existing,
+        queued=queued,
+        opened=opened,
+        elapsed=time.monotonic() - started
+    )
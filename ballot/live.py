@@ -0,0 +1,257 @@
+"""
+In-process publisher for the live turnout feed of the voting event admin.
+
+record_vote() calls notify() once a vote is committed. Every voting event has one EventFeed per
+process that bumps a version number on notify, and the snapshot (turnout and, optionally, the
+live tallies) is computed at most once per version and per process, however many dashboards are
+subscribed; subscribers only wait on the feed and send the shared snapshot. Votes committed by
+other server processes are picked up by a periodic check, again done once per feed.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Q, Sum
+
+from .models import VotingEvent, VotingEventInvitation
+from .reports import build_vote_structure, fold_text_answers
+from .tallies import summarize_tallies
+
+# Tells browsers how long to wait before reconnecting a dropped stream
+RECONNECT_DELAY_MS = 3000
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def compute_turnout(voting_event_id):
+    """
+    Submissions against invitations of a voting event, raw and weighted, with one query.
+    An invitation is used exactly when its member has voted.
+    """
+    totals = VotingEventInvitation.objects.filter(voting_event_id=voting_event_id).aggregate(
+        invitations=Count('pk'),
+        invited_weight=Sum('member__membership_weight'),
+        submissions=Count('pk', filter=Q(used_at__isnull=False)),
+        submitted_weight=Sum('member__membership_weight', filter=Q(used_at__isnull=False))
+    )
+    invitations, invited_weight = totals['invitations'], totals['invited_weight'] or 0
+    submissions, submitted_weight = totals['submissions'], totals['submitted_weight'] or 0
+    return {
+        'invitations': invitations,
+        'submissions': submissions,
+        'percent': round(100 * submissions / invitations, 2) if invitations else 0,
+        'invited_weight': invited_weight,
+        'submitted_weight': submitted_weight,
+        'weighted_percent': round(100 * submitted_weight / invited_weight, 2) if invited_weight else 0,
+    }
+
+
+def compute_tallies(voting_event_id):
+    """
+    Live results from the tally table, with short_text answers grouped as in reports.
+    """
+    voting_event = VotingEvent(pk=voting_event_id)
+    return fold_text_answers(summarize_tallies(voting_event), build_vote_structure(voting_event))
+
+
+class EventFeed:
+    """
+    Change notifications and cached snapshots for one voting event in this process.
+    """
+
+    def __init__(self, voting_event_id):
+        self.voting_event_id = voting_event_id
+        self.condition = threading.Condition()
+        self.compute_lock = threading.Lock()
+        self.version = 0
+        self.snapshots = {}  # include_tallies -> (version, payload)
+        self.computations = 0
+        self.last_checked = time.monotonic()
+        self.subscribers = 0  # open streams, guarded by _feeds_lock
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def snapshot(self, include_tallies=False):
+        """
+        (version, JSON payload) for the current version, computing it only if no subscriber
+        has done so yet. Concurrent callers wait for the one computing it; notify() doesn't, so
+        voters are never held up by a dashboard.
+        """
+        with self.compute_lock:
+            version = self.version
+            cached = self.snapshots.get(include_tallies)
+            if cached and cached[0] == version:
+                return cached
+
+            payload = {'voting_event_id': self.voting_event_id, 'turnout': compute_turnout(self.voting_event_id)}
+            if include_tallies:
+                payload['tallies'] = compute_tallies(self.voting_event_id)
+            self.computations += 1
+            self.last_checked = time.monotonic()
+
+            previous = self.snapshots.get(include_tallies)
+            encoded = json.dumps(payload, sort_keys=True)
+            if previous and previous[1] == encoded:
+                # Nothing changed; keep the old snapshot but mark it current
+                cached = (version, previous[1])
+            else:
+                cached = (version, encoded)
+            self.snapshots[include_tallies] = cached
+            return cached
+
+    def check_for_external_changes(self):
+        """
+        Bump the version when the poll interval has passed, so that votes committed by other
+        processes are noticed. Only one subscriber per interval gets to trigger it.
+        """
+        interval = _setting('BALLOT_LIVE_POLL_INTERVAL', 5)
+        with self.condition:
+            if time.monotonic() - self.last_checked < interval:
+                return
+            self.last_checked = time.monotonic()
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, seen_version, timeout):
+        """
+        Block until the version moves past seen_version or timeout seconds pass.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != seen_version, timeout=timeout)
+            return self.version
+
+
+_feeds = {}
+# Reentrant: garbage collection can finalize an abandoned stream, which unsubscribes, on a thread
+# that is inside subscribe() already
+_feeds_lock = threading.RLock()
+
+
+def get_feed(voting_event_id):
+    with _feeds_lock:
+        feed = _feeds.get(voting_event_id)
+        if feed is None:
+            feed = _feeds[voting_event_id] = EventFeed(voting_event_id)
+        return feed
+
+
+def subscribe(voting_event_id):
+    """
+    The feed of a voting event for a new stream, which must call unsubscribe() when it ends.
+    """
+    with _feeds_lock:
+        feed = _feeds.get(voting_event_id)
+        if feed is None:
+            feed = _feeds[voting_event_id] = EventFeed(voting_event_id)
+        feed.subscribers += 1
+        return feed
+
+
+def unsubscribe(feed):
+    """
+    End a stream's subscription; the feed of an event nobody watches any more is dropped.
+    """
+    with _feeds_lock:
+        feed.subscribers -= 1
+        if feed.subscribers <= 0 and _feeds.get(feed.voting_event_id) is feed:
+            del _feeds[feed.voting_event_id]
+
+
+def _snapshot_in_worker(feed, include_tallies):
+    # Runs on an executor thread that Django never closes connections for, so close them here
+    try:
+        return feed.snapshot(include_tallies)
+    finally:
+        connections.close_all()
+
+
+def notify(voting_event_id):
+    """
+    Tell the subscribers of a voting event that its turnout changed. Cheap when nobody listens.
+    """
+    with _feeds_lock:
+        feed = _feeds.get(voting_event_id)
+    if feed is not None:
+        feed.notify()
+
+
+# Last event of a stream that reached its maximum lifetime; the dashboard stops listening on it
+# instead of reconnecting, until the admin resumes it
+EXPIRED_EVENT = 'event: expired\ndata: {}\n\n'
+
+
+def _format_event(version, payload):
+    return f'id: {version}\nevent: turnout\ndata: {payload}\n\n'
+
+
+def iter_events(voting_event_id, include_tallies=False, max_events=None, max_seconds=None):
+    """
+    Server-Sent Events stream of snapshots for a voting event, for WSGI servers: the thread
+    blocks on the feed between updates and sends a comment line as heartbeat while idle. As the
+    stream holds a worker thread, it ends with an 'expired' event after max_seconds.
+    """
+    feed = subscribe(voting_event_id)
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+    try:
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+
+        sent_payload, sent, idle = None, 0, False
+        while max_events is None or sent < max_events:
+            version, payload = feed.snapshot(include_tallies)
+            if payload != sent_payload:
+                yield _format_event(version, payload)
+                sent_payload, sent = payload, sent + 1
+            elif idle:
+                yield ': keepalive\n\n'
+
+            timeout = _setting('BALLOT_LIVE_POLL_INTERVAL', 5)
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    yield EXPIRED_EVENT
+                    return
+            idle = feed.wait(version, timeout=timeout) == version
+            if idle:
+                feed.check_for_external_changes()
+    finally:
+        unsubscribe(feed)
+
+
+async def aiter_events(voting_event_id, include_tallies=False, max_events=None):
+    """
+    Async variant of iter_events for ASGI servers. Waiting is a cheap in-memory check of the feed
+    version, so an open dashboard holds no thread; snapshots are computed in a worker thread,
+    which closes its database connections afterwards.
+    """
+    feed = subscribe(voting_event_id)
+    snapshot = sync_to_async(_snapshot_in_worker, thread_sensitive=False)
+    try:
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+
+        sent_payload, sent, idle = None, 0, False
+        while max_events is None or sent < max_events:
+            version, payload = await snapshot(feed, include_tallies)
+            if payload != sent_payload:
+                yield _format_event(version, payload)
+                sent_payload, sent = payload, sent + 1
+            elif idle:
+                yield ': keepalive\n\n'
+
+            waited, interval = 0, _setting('BALLOT_LIVE_POLL_INTERVAL', 5)
+            while feed.version == version and waited < interval:
+                await asyncio.sleep(0.25)
+                waited += 0.25
+            idle = feed.version == version
+            if idle:
+                feed.check_for_external_changes()
+    finally:
+        unsubscribe(feed)
@@ -0,0 +1,80 @@
+from django.db.models import Exists, OuterRef
+from django.http import Http404
+
+from . import token_cache
+from .caching import get_ballot_definition
+from .models import Submission, VotingEvent, VotingEventInvitation, secret_for_token
+
+
+def invitation_queryset():
+    """
+    Invitations with everything the voter endpoints need to decide what to show, in one query.
+    The event and member are joined in, and whether the member is still on the event's roll and
+    whether they have already voted are answered by EXISTS subqueries on the same row.
+    """
+    on_roll = VotingEvent.members.through.objects.filter(
+        votingevent_id=OuterRef('voting_event_id'),
+        member_id=OuterRef('member_id')
+    )
+    submitted = Submission.objects.filter(
+        voting_event_id=OuterRef('voting_event_id'),
+        member_id=OuterRef('member_id')
+    )
+    return VotingEventInvitation.objects.select_related('voting_event', 'member').annotate(
+        is_authorized=Exists(on_roll),
+        has_voted=Exists(submitted)
+    )
+
+
+def load_invitation(token, cached=None):
+    """
+    Fetch the annotated invitation for a voting token, or raise Http404.
+    Pass the token cache entry if the caller already looked it up: known tokens are then fetched
+    by primary key, and unknown ones are rejected without touching the database. The outcome of
+    the lookup is written back to the token cache.
+    """
+    if cached is None:
+        cached = token_cache.get(token)
+    if cached == token_cache.UNKNOWN:
+        raise Http404("No invitation matches the given token.")
+
+    lookup = {'secret': secret_for_token(token)}
+    if cached is not None:
+        lookup['pk'] = cached.invitation_id
+
+    invitation = invitation_queryset().filter(**lookup).first()
+    if invitation is None:
+        token_cache.remember_unknown(token)
+        raise Http404("No invitation matches the given token.")
+
+    token_cache.remember(token, invitation)
+    return invitation
+
+
+async def aload_invitation(token, cached=None):
+    """
+    Async counterpart of load_invitation, using the async ORM and the async cache API.
+    """
+    if cached is None:
+        cached = await token_cache.aget(token)
+    if cached == token_cache.UNKNOWN:
+        raise Http404("No invitation matches the given token.")
+
+    lookup = {'secret': secret_for_token(token)}
+    if cached is not None:
+        lookup['pk'] = cached.invitation_id
+
+    invitation = await invitation_queryset().filter(**lookup).afirst()
+    if invitation is None:
+        await token_cache.aremember_unknown(token)
+        raise Http404("No invitation matches the given token.")
+
+    await token_cache.aremember(token, invitation)
+    return invitation
+
+
+def load_votes(voting_event):
+    """
+    Return the ordered votes (questions) of a voting event as a list, from the ballot cache.
+    """
+    return get_ballot_definition(voting_event)['votes']
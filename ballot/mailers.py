@@ -0,0 +1,155 @@
+import http.client
+import json
+import random
+import smtplib
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core import mail
+from django.utils.module_loading import import_string
+
+
+class DeliveryError(Exception):
+    """The message was rejected and retrying it won't help (bad address, invalid payload)."""
+
+
+class TemporaryDeliveryError(DeliveryError):
+    """The provider could not take the message right now (rate limited, timeout, 5xx); retry later."""
+
+
+class BaseMailer:
+    """
+    Sends invitation emails for the dispatch worker.
+    A mailer is opened once per worker run and reused for every message, so backends can keep
+    a connection (HTTP keep-alive, SMTP session) open across a whole batch.
+    """
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, message):
+        """
+        Deliver a single message dict with 'to', 'name', 'subject' and 'body' keys.
+        Raises TemporaryDeliveryError for retryable failures and DeliveryError otherwise.
+        """
+        raise NotImplementedError
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SMTPMailer(BaseMailer):
+    """
+    Sends through Django's configured EMAIL_BACKEND, reusing one SMTP connection per worker run.
+    """
+
+    def open(self):
+        self.connection = mail.get_connection(fail_silently=False)
+        self.connection.open()
+
+    def close(self):
+        self.connection.close()
+
+    def send(self, message):
+        # Reopening is a no-op while the session is alive
+        self.connection.open()
+        email = mail.EmailMessage(
+            subject=message['subject'],
+            body=message['body'],
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[message['to']],
+            connection=self.connection
+        )
+        try:
+            email.send()
+        except (smtplib.SMTPRecipientsRefused, mail.BadHeaderError) as exc:
+            raise DeliveryError(str(exc)) from exc
+        except OSError as exc:
+            # Drop the broken session; the next message reconnects
+            self.connection.close()
+            raise TemporaryDeliveryError(str(exc)) from exc
+
+
+class BrevoMailer(BaseMailer):
+    """
+    Sends through the Brevo transactional email API over a single persistent HTTPS connection.
+    """
+
+    host = 'api.brevo.com'
+    path = '/v3/smtp/email'
+    timeout = 10
+
+    def open(self):
+        if not settings.BREVO_API_KEY:
+            raise DeliveryError("BREVO_API_KEY is not configured.")
+        self.connection = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def close(self):
+        self.connection.close()
+
+    def send(self, message):
+        payload = json.dumps({
+            'sender': {'email': settings.DEFAULT_FROM_EMAIL},
+            'to': [{'email': message['to'], 'name': message['name']}],
+            'subject': message['subject'],
+            'textContent': message['body'],
+        })
+        headers = {
+            'api-key': settings.BREVO_API_KEY,
+            'content-type': 'application/json',
+            'accept': 'application/json',
+        }
+
+        try:
+            self.connection.request('POST', self.path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            # The keep-alive connection is unusable now; the next request reconnects
+            self.connection.close()
+            raise TemporaryDeliveryError(str(exc)) from exc
+
+        if response.status == 429 or response.status >= 500:
+            raise TemporaryDeliveryError(f"Brevo returned {response.status}: {body[:200]!r}")
+        if response.status >= 400:
+            raise DeliveryError(f"Brevo returned {response.status}: {body[:200]!r}")
+
+
+class FakeMailer(BaseMailer):
+    """
+    Keeps messages in memory instead of sending them: the last outbox_size accepted messages in
+    self.outbox and their total count in self.sent, so a long-running worker doesn't grow without
+    bound. BALLOT_FAKE_MAILER_LATENCY (seconds per message) and BALLOT_FAKE_MAILER_FAILURE_RATE
+    (0..1, temporary failures) simulate a real provider so the dispatch pipeline can be load-tested
+    offline.
+    """
+
+    outbox_size = 1000
+
+    def __init__(self):
+        self.outbox = deque(maxlen=self.outbox_size)
+        self.sent = 0
+
+    def send(self, message):
+        latency = getattr(settings, 'BALLOT_FAKE_MAILER_LATENCY', 0)
+        if latency:
+            time.sleep(latency)
+        if random.random() < getattr(settings, 'BALLOT_FAKE_MAILER_FAILURE_RATE', 0):
+            raise TemporaryDeliveryError("Simulated provider failure")
+        self.outbox.append(message)
+        self.sent += 1
+
+
+def get_mailer():
+    """
+    Instantiate the mailer configured by BALLOT_INVITATION_MAILER.
+    """
+    return import_string(settings.BALLOT_INVITATION_MAILER)()
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from ballot.benchmarking import ServerProcess, cast_vote, format_result, run_load, seeded_voting_event, view_ballot
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync WSGI voter views (gunicorn sync workers) with the async ASGI views "
+        "(gunicorn + uvicorn workers) on the same seeded voting event. Both servers use the "
+        "configured database, so seed a scratch database (e.g. DATABASE_URL=sqlite:////tmp/bench.sqlite3)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=2000, help='Members (and invitations) to seed')
+        parser.add_argument('--concurrency', type=int, default=50, help='Simultaneous voters')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes per mode')
+        parser.add_argument(
+            '--keep-data', action='store_true', help='Keep the seeded event, members and invitations afterwards'
+        )
+
+    def handle(self, *args, **options):
+        with seeded_voting_event(options['members'], keep=options['keep_data']) as (voting_event, tokens, answers):
+            self.stdout.write(f"Seeded {voting_event} (#{voting_event.pk}) with {len(tokens)} invitations")
+
+            # Both modes read every ballot before any vote is cast, then each mode casts votes on its own
+            # half of the roll, so both see the same data
+            half = len(tokens) // 2
+            vote_tokens = {'wsgi': tokens[:half], 'asgi': tokens[half:]}
+            concurrency = options['concurrency']
+
+            with ServerProcess(mode='wsgi', workers=options['workers']) as wsgi_server, \
+                    ServerProcess(mode='asgi', workers=options['workers']) as asgi_server:
+                servers = {'wsgi': wsgi_server, 'asgi': asgi_server}
+
+                for mode, server in servers.items():
+                    # Warm up caches and connections before measuring
+                    run_load('127.0.0.1', server.port, view_ballot, tokens[:concurrency], answers, concurrency)
+                    result = run_load('127.0.0.1', server.port, view_ballot, tokens, answers, concurrency)
+                    self.stdout.write(format_result(f"{mode} vote_view", result))
+
+                for mode, server in servers.items():
+                    result = run_load('127.0.0.1', server.port, cast_vote, vote_tokens[mode], answers, concurrency)
+                    self.stdout.write(format_result(f"{mode} view+submit", result))
@@ -0,0 +1,76 @@
+import importlib.util
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+from ballot.benchmarking import ServerProcess, format_result, run_load, seeded_voting_event, view_ballot
+
+
+class Command(BaseCommand):
+    help = (
+        "Show what opening a database connection per request costs. First times connect + query + "
+        "close against a query on an open connection in this process, then serves the voting form "
+        "through gunicorn with DATABASE_CONN_MAX_AGE=0 (a new connection per request), with persistent "
+        "connections and, on PostgreSQL with psycopg-pool installed, with the connection pool. Uses "
+        "the configured database; with pgbouncer in front the first figure shows its setup cost."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Connections to open in-process')
+        parser.add_argument('--members', type=int, default=500, help='Invitations to spread requests over')
+        parser.add_argument('--requests', type=int, default=3000, help='Requests per server configuration')
+        parser.add_argument('--concurrency', type=int, default=16, help='Simultaneous clients')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per worker')
+        parser.add_argument(
+            '--keep-data', action='store_true', help='Keep the seeded event, members and invitations afterwards'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}")
+        self.time_connections(options['iterations'])
+
+        seeded = seeded_voting_event(
+            options['members'], title='Connection Benchmark Assembly', keep=options['keep_data']
+        )
+        with seeded as (voting_event, tokens, answers):
+            requests = (tokens * (options['requests'] // len(tokens) + 1))[:options['requests']]
+            connection.close()
+
+            configurations = [
+                ('new connection', {'DATABASE_CONN_MAX_AGE': '0'}),
+                ('persistent', {'DATABASE_CONN_MAX_AGE': '600'}),
+            ]
+            if (connection.vendor == 'postgresql' and django.VERSION >= (5, 1)
+                    and importlib.util.find_spec('psycopg_pool')):
+                configurations.append(('pool', {'DATABASE_POOL': 'True'}))
+
+            for label, env in configurations:
+                with ServerProcess(workers=options['workers'], threads=options['threads'], env=env) as server:
+                    concurrency = options['concurrency']
+                    run_load('127.0.0.1', server.port, view_ballot, requests[:concurrency * 4], answers, concurrency)
+                    result = run_load('127.0.0.1', server.port, view_ballot, requests, answers, concurrency)
+                self.stdout.write(format_result(label, result))
+
+    def time_connections(self, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fresh = connections.create_connection(DEFAULT_DB_ALIAS)
+            with fresh.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            fresh.close()
+        fresh_time = (time.perf_counter() - started) / iterations
+
+        connection.ensure_connection()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        reused_time = (time.perf_counter() - started) / iterations
+
+        self.stdout.write(
+            f"connect + query + close {fresh_time * 1000:.3f}ms, query on an open connection "
+            f"{reused_time * 1000:.3f}ms: {(fresh_time - reused_time) * 1000:.3f}ms setup per request"
+        )
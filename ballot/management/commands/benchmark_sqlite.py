@@ -0,0 +1,93 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from ballot.benchmarking import ServerProcess, cast_vote, format_result, run_load, seeded_voting_event, view_ballot
+from ballot.models import Member, Submission
+
+
+def hold_read_lock(stop, hold):
+    """
+    Act like a slow report export: keep a SELECT open for hold seconds at a time until stopped.
+    Without WAL the open statement holds a shared lock that keeps every writer from committing.
+    """
+    try:
+        while not stop.is_set():
+            rows = Member.objects.values_list('pk', flat=True).iterator(chunk_size=1)
+            next(rows, None)
+            stop.wait(hold)
+            rows.close()
+            time.sleep(0.05)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure sustained vote submission throughput on SQLite with several gunicorn workers while slow "
+        "report exports read the database: first with the default rollback journal and deferred "
+        "transactions, then with BALLOT_SQLITE_TUNING (WAL, pragmas, BEGIN IMMEDIATE). Run it on a "
+        "scratch database, e.g. DATABASE_URL=sqlite:////tmp/bench.sqlite3, migrated first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=2000, help='Members (and invitations) to seed')
+        parser.add_argument('--concurrency', type=int, default=32, help='Simultaneous voters')
+        parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per worker')
+        parser.add_argument('--readers', type=int, default=1, help='Slow report exports reading alongside')
+        parser.add_argument('--hold', type=float, default=1.0, help='Seconds each export keeps its read open')
+        parser.add_argument(
+            '--keep-data', action='store_true', help='Keep the seeded event, members and invitations afterwards'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("This benchmark needs a SQLite database.")
+
+        seeded = seeded_voting_event(options['members'], title='SQLite Benchmark Assembly', keep=options['keep_data'])
+        with seeded as (voting_event, tokens, answers):
+            self.stdout.write(f"Seeded {voting_event} (#{voting_event.pk}) with {len(tokens)} invitations")
+
+            half = len(tokens) // 2
+            runs = [('default', False, tokens[:half]), ('tuned', True, tokens[half:])]
+            for label, tuning, run_tokens in runs:
+                if not tuning:
+                    # WAL mode is stored in the database file, so turn it off explicitly for the baseline
+                    with connection.cursor() as cursor:
+                        cursor.execute('PRAGMA journal_mode = DELETE')
+                connection.close()
+
+                server = ServerProcess(
+                    workers=options['workers'], threads=options['threads'], env={'BALLOT_SQLITE_TUNING': str(tuning)}
+                )
+                # The export threads open connections in this process, which must not switch the journal mode
+                with server, override_settings(BALLOT_SQLITE_TUNING=tuning):
+                    concurrency = options['concurrency']
+                    run_load('127.0.0.1', server.port, view_ballot, run_tokens[:concurrency], answers, concurrency)
+
+                    stop = threading.Event()
+                    readers = [
+                        threading.Thread(target=hold_read_lock, args=(stop, options['hold']))
+                        for _ in range(options['readers'])
+                    ]
+                    for reader in readers:
+                        reader.start()
+                    try:
+                        result = run_load('127.0.0.1', server.port, cast_vote, run_tokens, answers, concurrency)
+                    finally:
+                        stop.set()
+                        for reader in readers:
+                            reader.join()
+
+                submitted = Submission.objects.filter(
+                    voting_event=voting_event, member__invitations__secret__in=run_tokens
+                ).count()
+                server_errors = sum(sample.status >= 500 for sample in result.samples)
+                self.stdout.write(
+                    f"{format_result(label, result)}  {submitted / result.elapsed:>7.1f} votes/s "
+                    f"({submitted} of {len(run_tokens)} recorded, {server_errors} server errors)"
+                )
@@ -0,0 +1,62 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ballot.reports import _accumulate
+from ballot.tally_engine import TallyEngine, backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the dict based report tally loop with the array based tally engine on synthetic "
+        "submissions held in memory (no database access). Both results are checked for equality. "
+        "NumPy is optional (not in requirements.txt); without it the engine counts with "
+        "collections.Counter, and the backend line of the output says which one ran."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int, default=[10000, 100000, 1000000], help='Submission counts to run'
+        )
+        parser.add_argument('--votes', type=int, default=3, help='Votes per submission')
+        parser.add_argument('--answers', type=int, default=4, help='Distinct answers per vote')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Tally engine backend: {backend()}")
+        for size in options['sizes']:
+            rows = self.make_rows(size, options['votes'], options['answers'], options['seed'])
+
+            started = time.perf_counter()
+            expected = {}
+            for votes, weight in rows:
+                _accumulate(expected, votes, weight)
+            loop_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            engine = TallyEngine().extend(rows)
+            encode_time = time.perf_counter() - started
+            started = time.perf_counter()
+            summary = engine.summary()
+            count_time = time.perf_counter() - started
+
+            if summary != expected:
+                raise CommandError(f"Tally engine result differs from the dict loop at {size} submissions")
+
+            engine_time = encode_time + count_time
+            self.stdout.write(
+                f"{size:>9} submissions: dict loop {loop_time * 1000:9.1f}ms  "
+                f"engine {engine_time * 1000:9.1f}ms (encode {encode_time * 1000:.1f}ms, "
+                f"count {count_time * 1000:.1f}ms)  speedup {loop_time / engine_time:.2f}x"
+            )
+            del rows
+
+    def make_rows(self, size, vote_count, answer_count, seed):
+        generator = random.Random(seed)
+        vote_ids = [str(vote_id) for vote_id in range(1, vote_count + 1)]
+        answers = [f'answer {index}' for index in range(answer_count)]
+        return [
+            ({vote_id: generator.choice(answers) for vote_id in vote_ids}, generator.randint(1, 5))
+            for _ in range(size)
+        ]
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ballot.dispatch import DISPATCH_BATCH_SIZE, MAX_ATTEMPTS, dispatch_pending
+from ballot.mailers import get_mailer
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued invitation emails from the outbox in batches, with retries, exponential "
+        "backoff and send-rate throttling. Run with --loop as a long-lived background worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DISPATCH_BATCH_SIZE, help='Outbox rows claimed per batch')
+        parser.add_argument('--rate', type=float, default=0, help='Maximum messages per second (0 = unthrottled)')
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS, help='Attempts before a message is marked failed')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting when it is drained')
+        parser.add_argument('--idle-sleep', type=float, default=5, help='Seconds to wait between polls in --loop mode')
+
+    def handle(self, *args, **options):
+        mailer = get_mailer()
+
+        while True:
+            started = time.monotonic()
+            result = dispatch_pending(
+                batch_size=options['batch_size'],
+                rate=options['rate'],
+                max_attempts=options['max_attempts'],
+                mailer=mailer
+            )
+            if any(result) or not options['loop']:
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"Sent {result.sent}, rescheduled {result.retried}, failed {result.failed} "
+                    f"in {elapsed:.2f}s ({result.sent / elapsed if elapsed else 0:.1f} msg/s)"
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['idle_sleep'])
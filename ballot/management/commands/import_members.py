@@ -0,0 +1,83 @@
+import io
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ballot.models import VotingEvent
+from ballot.rolls import ROLL_BATCH_SIZE, RollError, sync_roll
+
+
+class Command(BaseCommand):
+    help = (
+        "Import or sync members from a CSV file with email, name and membership_weight columns. "
+        "Members are matched by email; new ones are created and changed names or weights updated "
+        "in bulk. Optionally put everyone in the file on the roll of a voting event."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="Path of the CSV file, or '-' for standard input")
+        parser.add_argument('--event', type=int, help='Voting event id whose roll the members are added to')
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='With --event, also take members that are not in the file off the roll'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Print the changes without writing anything')
+        parser.add_argument('--batch-size', type=int, default=ROLL_BATCH_SIZE, help='Rows per INSERT/UPDATE statement')
+        parser.add_argument('--show', type=int, default=20, help='Changes and errors to list with --dry-run')
+
+    def handle(self, *args, **options):
+        voting_event = None
+        if options['event'] is not None:
+            try:
+                voting_event = VotingEvent.objects.get(pk=options['event'])
+            except VotingEvent.DoesNotExist:
+                raise CommandError(f"Voting event {options['event']} does not exist.")
+        elif options['replace']:
+            raise CommandError("--replace needs --event.")
+
+        started = time.monotonic()
+        try:
+            if options['csv_file'] == '-':
+                lines = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+                result = self.sync(lines, voting_event, options)
+            else:
+                with open(options['csv_file'], encoding='utf-8-sig', newline='') as lines:
+                    result = self.sync(lines, voting_event, options)
+        except (OSError, RollError) as error:
+            raise CommandError(str(error))
+        elapsed = time.monotonic() - started
+
+        if options['dry_run']:
+            self.print_diff(result, options['show'])
+
+        prefix = 'Would' if options['dry_run'] else 'Did'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} create {result.created}, update {result.updated}, keep {result.unchanged} members"
+            + (f"; attach {result.attached}, detach {result.detached} on {voting_event}" if voting_event else "")
+        ))
+        if result.errors:
+            self.stdout.write(self.style.WARNING(f"Skipped {len(result.errors)} invalid rows"))
+            if not options['dry_run']:
+                for line, message in result.errors[:options['show']]:
+                    self.stdout.write(f"  line {line}: {message}")
+        timings = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in result.timings.items())
+        self.stdout.write(f"Timings: {timings}, total {elapsed:.2f}s")
+
+    def sync(self, lines, voting_event, options):
+        return sync_roll(
+            lines,
+            voting_event=voting_event,
+            replace=options['replace'],
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size']
+        )
+
+    def print_diff(self, result, show):
+        for member in result.diff.create[:show]:
+            self.stdout.write(f"+ {member.email}  {member.name}  weight {member.membership_weight}")
+        for member in result.diff.update[:show]:
+            self.stdout.write(f"~ {member.email}  {member.name}  weight {member.membership_weight}")
+        for line, message in result.errors[:show]:
+            self.stdout.write(f"! line {line}: {message}")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ballot.invitations import INVITATION_BATCH_SIZE, create_invitations
+from ballot.models import VotingEvent
+
+
+class Command(BaseCommand):
+    help = "Create the missing invitations for all members of a voting event and open it."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', type=int, help='Voting event id')
+        parser.add_argument('--batch-size', type=int, default=INVITATION_BATCH_SIZE, help='Rows per INSERT statement')
+        parser.add_argument('--no-open', action='store_true', help='Only create invitations, leave the event state alone')
+        parser.add_argument(
+            '--email-existing',
+            action='store_true',
+            help='Also queue emails for unused invitations that were never emailed, e.g. created before the outbox'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            voting_event = VotingEvent.objects.get(pk=options['event_id'])
+        except VotingEvent.DoesNotExist:
+            raise CommandError(f"Voting event {options['event_id']} does not exist.")
+
+        result = create_invitations(
+            voting_event,
+            batch_size=options['batch_size'],
+            open_event=not options['no_open'],
+            email_existing=options['email_existing']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{voting_event} (#{voting_event.pk}): created {result.created} invitations, "
+            f"{result.existing} already existed, queued {result.queued} emails, {result.elapsed:.2f}s"
+        ))
+        self.stdout.write(f"Voting event state: {voting_event.state}{' (opened now)' if result.opened else ''}")
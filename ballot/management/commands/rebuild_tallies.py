@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ballot.models import VotingEvent
+from ballot.tallies import EventOpen, compare_tallies, compute_tallies, rebuild_tallies
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the live vote tallies from raw submissions and cross-check them against "
+        "the stored VoteTally rows. Answers keep the member weight they were cast with. Open voting "
+        "events are only checked, not rebuilt, unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', type=int, help='Voting event ids (default: all events)')
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report mismatches, do not rewrite the tally table. Exits non-zero on mismatch.'
+        )
+        parser.add_argument('--force', action='store_true', help='Rebuild open voting events too')
+
+    def handle(self, *args, **options):
+        events = VotingEvent.objects.all()
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+            missing = set(options['event_ids']) - set(events.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f"Unknown voting event ids: {', '.join(map(str, sorted(missing)))}")
+
+        mismatched_events = refused_events = 0
+        for voting_event in events:
+            if options['check']:
+                mismatches = compare_tallies(voting_event, compute_tallies(voting_event))
+            else:
+                try:
+                    row_count, mismatches = rebuild_tallies(voting_event, force=options['force'])
+                except EventOpen as error:
+                    self.stdout.write(self.style.WARNING(f"{voting_event} (#{voting_event.pk}): skipped, {error}"))
+                    refused_events += 1
+                    continue
+
+            for vote_id, answer, stored, computed in mismatches:
+                self.stdout.write(
+                    f"  vote {vote_id} answer {answer!r}: stored={stored} computed={computed}"
+                )
+            if mismatches:
+                mismatched_events += 1
+
+            if options['check']:
+                status = f"{len(mismatches)} mismatches" if mismatches else "OK"
+                self.stdout.write(f"{voting_event} (#{voting_event.pk}): {status}")
+                continue
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{voting_event} (#{voting_event.pk}): rebuilt {row_count} tally rows, "
+                f"fixed {len(mismatches)} mismatches"
+            ))
+
+        if options['check'] and mismatched_events:
+            raise CommandError(f"{mismatched_events} voting event(s) have inconsistent tallies.")
+        if refused_events:
+            raise CommandError(f"{refused_events} open voting event(s) not rebuilt; use --force to rebuild them.")
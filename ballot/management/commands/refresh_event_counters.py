@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from ballot.counters import refresh_event_totals
+from ballot.models import VotingEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the precomputed member, vote and submission counters of voting events, which the "
+        "admin changelist shows when BALLOT_PRECOMPUTED_COUNTERS is enabled. Run it periodically "
+        "(e.g. every minute from cron) while an event is open."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', type=int, help='Voting event ids (default: all events)')
+        parser.add_argument('--open-only', action='store_true', help='Only refresh events that are currently open')
+
+    def handle(self, *args, **options):
+        events = VotingEvent.objects.all()
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+        if options['open_only']:
+            events = events.filter(state='open')
+
+        refreshed = refresh_event_totals(events)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed counters of {refreshed} voting event(s)."))
@@ -0,0 +1,124 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from . import instrumentation
+
+# Response header carrying the number of SQL queries a request ran, read by the load test
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper hook that counts the queries it sees.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _wrap_connections(stack, hook):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(hook))
+
+
+class QueryHookMiddleware:
+    """
+    Base of the middleware below, which install an execute_wrapper hook on the database
+    connections for the duration of a request. Under ASGI the request's ORM calls run in its
+    thread-sensitive worker thread, whose connections differ from the event loop's, so the hook
+    is installed and removed there; the request itself stays async.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        hook, state = self.start(request)
+        try:
+            with ExitStack() as stack:
+                _wrap_connections(stack, hook)
+                response = self.get_response(request)
+        except BaseException:
+            self.abort(state)
+            raise
+        return self.finish(request, response, hook, state)
+
+    async def __acall__(self, request):
+        hook, state = self.start(request)
+        stack = ExitStack()
+        try:
+            await sync_to_async(_wrap_connections)(stack, hook)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        except BaseException:
+            self.abort(state)
+            raise
+        return self.finish(request, response, hook, state)
+
+    def start(self, request):
+        """The execute_wrapper hook for a request and any state finish() needs."""
+        raise NotImplementedError
+
+    def finish(self, request, response, hook, state):
+        return response
+
+    def abort(self, state):
+        pass
+
+
+class QueryCountMiddleware(QueryHookMiddleware):
+    """
+    Adds an X-Query-Count header with the number of queries run for the request, on every
+    configured database. Enabled with BALLOT_QUERY_COUNT_HEADER; meant for load tests and
+    benchmarks, not for production traffic.
+    """
+
+    def start(self, request):
+        return QueryCounter(), None
+
+    def finish(self, request, response, counter, state):
+        response[QUERY_COUNT_HEADER] = str(counter.count)
+        return response
+
+
+class InstrumentationMiddleware(QueryHookMiddleware):
+    """
+    Records wall time, SQL queries and time, template render time and response size of every
+    request into the metrics of ballot.instrumentation, and logs slow requests. Enabled with
+    BALLOT_INSTRUMENTATION.
+    """
+
+    def start(self, request):
+        record = instrumentation.RequestRecord(getattr(settings, 'BALLOT_SLOW_REQUEST_TOP_QUERIES', 5))
+        return record, (instrumentation.activate(record), time.perf_counter())
+
+    def finish(self, request, response, record, state):
+        token, started = state
+        instrumentation.deactivate(token)
+        instrumentation.observe(request, response, record, time.perf_counter() - started)
+        return response
+
+    def abort(self, state):
+        instrumentation.deactivate(state[0])
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        tag = getattr(view_func, 'instrumentation_tag', None)
+        if tag:
+            instrumentation.tag_request(request, tag)
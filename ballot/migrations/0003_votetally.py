@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_tallies(apps, schema_editor):
+    """
+    Tally the submissions recorded before the tally table existed, like the rebuild_tallies
+    command does, since the 'tallies' report summary reads nothing else. Weights are the
+    members' current weights.
+    """
+    Submission = apps.get_model('ballot', 'Submission')
+    Vote = apps.get_model('ballot', 'Vote')
+    VoteTally = apps.get_model('ballot', 'VoteTally')
+    db_alias = schema_editor.connection.alias
+
+    event_ids = Submission.objects.using(db_alias).order_by().values_list('voting_event_id', flat=True).distinct()
+    for voting_event_id in list(event_ids):
+        vote_ids = set(Vote.objects.using(db_alias).filter(voting_event_id=voting_event_id).values_list('id', flat=True))
+        submissions = Submission.objects.using(db_alias).filter(voting_event_id=voting_event_id).values_list(
+            'submission_data', 'member__membership_weight'
+        )
+
+        tallies = {}
+        for submission_data, weight in submissions.iterator(chunk_size=BATCH_SIZE):
+            for vote_key, answer in submission_data.items():
+                if int(vote_key) not in vote_ids:
+                    continue
+                totals = tallies.setdefault((int(vote_key), answer), [0, 0])
+                totals[0] += 1
+                totals[1] += weight
+
+        VoteTally.objects.using(db_alias).bulk_create(
+            [
+                VoteTally(voting_event_id=voting_event_id, vote_id=vote_id, answer=answer, count=count, weighted=weighted)
+                for (vote_id, answer), (count, weighted) in tallies.items()
+            ],
+            batch_size=BATCH_SIZE
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0002_votingeventinvitation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answer', models.TextField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('weighted', models.PositiveBigIntegerField(default=0)),
+                ('vote', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tallies', to='ballot.vote')),
+                ('voting_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tallies', to='ballot.votingevent')),
+            ],
+            options={
+                'ordering': ['vote', 'answer'],
+                'unique_together': {('voting_event', 'vote', 'answer')},
+            },
+        ),
+        migrations.RunPython(backfill_tallies, migrations.RunPython.noop),
+    ]
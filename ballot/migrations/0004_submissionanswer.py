@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0003_votetally'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.TextField()),
+                ('weight', models.PositiveIntegerField()),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='ballot.submission')),
+                ('vote', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='ballot.vote')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['vote', 'value'], name='ballot_answer_vote_value_idx')],
+                'unique_together': {('submission', 'vote')},
+            },
+        ),
+    ]
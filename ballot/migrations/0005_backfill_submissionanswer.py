@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_answers(apps, schema_editor):
+    """
+    Create one SubmissionAnswer row per answered vote from the existing submission JSON.
+    The weight snapshot uses the member's current weight, which is what reports used so far.
+    """
+    Submission = apps.get_model('ballot', 'Submission')
+    SubmissionAnswer = apps.get_model('ballot', 'SubmissionAnswer')
+    Vote = apps.get_model('ballot', 'Vote')
+    db_alias = schema_editor.connection.alias
+
+    vote_ids = set(Vote.objects.using(db_alias).values_list('id', flat=True))
+    submissions = Submission.objects.using(db_alias).filter(answers__isnull=True).values_list(
+        'id', 'member__membership_weight', 'submission_data'
+    )
+
+    batch = []
+    for submission_id, weight, submission_data in submissions.iterator(chunk_size=BATCH_SIZE):
+        for vote_key, value in submission_data.items():
+            if int(vote_key) not in vote_ids:
+                continue
+            batch.append(SubmissionAnswer(submission_id=submission_id, vote_id=int(vote_key), value=value, weight=weight))
+        if len(batch) >= BATCH_SIZE:
+            SubmissionAnswer.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    if batch:
+        SubmissionAnswer.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0004_submissionanswer'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_answers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:32
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def fill_totals(apps, schema_editor):
+    VotingEvent = apps.get_model('ballot', 'VotingEvent')
+    Vote = apps.get_model('ballot', 'Vote')
+    Submission = apps.get_model('ballot', 'Submission')
+    db_alias = schema_editor.connection.alias
+
+    def count(queryset, event_field):
+        counted = queryset.filter(**{event_field: OuterRef('pk')}).order_by().values(event_field).annotate(
+            total=Count('*')
+        ).values('total')
+        return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+    VotingEvent.objects.using(db_alias).update(
+        member_total=count(VotingEvent.members.through.objects.all(), 'votingevent_id'),
+        vote_total=count(Vote.objects.all(), 'voting_event_id'),
+        submission_total=count(Submission.objects.all(), 'voting_event_id'),
+        totals_updated_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0006_invitationemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='votingevent',
+            name='member_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='votingevent',
+            name='submission_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='votingevent',
+            name='totals_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='votingevent',
+            name='vote_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
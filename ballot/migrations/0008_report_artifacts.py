@@ -0,0 +1,175 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:35
+
+import gzip
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Copies of the ballot.artifacts helpers as they were when this migration was written, so later
+# changes to that module can't change what the migration does
+CHUNK_ROWS = 1000
+
+
+def submission_line(member_id, email, weight, votes):
+    return json.dumps(
+        {'member_id': member_id, 'member_email': email, 'weight': weight, 'votes': votes},
+        sort_keys=True,
+        separators=(',', ':')
+    ).encode() + b'\n'
+
+
+def decompress(data, encoding):
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("A report artifact is Zstandard compressed; install the zstandard package to migrate it.")
+        return zstandard.ZstdDecompressor().decompress(bytes(data))
+    return gzip.decompress(bytes(data))
+
+
+def store_artifact(submissions, ReportArtifact, ReportArtifactChunk, db_alias):
+    """
+    Store submissions, sorted by member id, as a gzip artifact; reuse an artifact with the same content.
+    """
+    lines = [
+        submission_line(submission['member_id'], submission['member_email'], submission['weight'], submission['votes'])
+        for submission in submissions
+    ]
+    content_hash = hashlib.sha256(b''.join(lines)).hexdigest()
+    artifact = ReportArtifact.objects.using(db_alias).filter(content_hash=content_hash).first()
+    if artifact is not None:
+        return artifact
+
+    chunks = []
+    for offset in range(0, len(submissions), CHUNK_ROWS):
+        chunk = submissions[offset:offset + CHUNK_ROWS]
+        chunks.append(ReportArtifactChunk(
+            sequence=len(chunks),
+            first_member_id=chunk[0]['member_id'],
+            last_member_id=chunk[-1]['member_id'],
+            row_count=len(chunk),
+            data=gzip.compress(b''.join(lines[offset:offset + CHUNK_ROWS]), compresslevel=6)
+        ))
+    artifact = ReportArtifact.objects.using(db_alias).create(
+        content_hash=content_hash,
+        encoding='gzip',
+        row_count=len(submissions),
+        compressed_size=sum(len(chunk.data) for chunk in chunks)
+    )
+    for chunk in chunks:
+        chunk.artifact = artifact
+    ReportArtifactChunk.objects.using(db_alias).bulk_create(chunks, batch_size=100)
+    return artifact
+
+
+def move_report_data(apps, schema_editor):
+    # Split every stored report into its summary and a compressed artifact of its submissions
+    VotingReport = apps.get_model('ballot', 'VotingReport')
+    ReportArtifact = apps.get_model('ballot', 'ReportArtifact')
+    ReportArtifactChunk = apps.get_model('ballot', 'ReportArtifactChunk')
+    db_alias = schema_editor.connection.alias
+
+    for report in VotingReport.objects.using(db_alias).iterator(chunk_size=1):
+        report_data = dict(report.report_data or {})
+        submissions = sorted(report_data.pop('submissions', []), key=lambda submission: submission['member_id'])
+
+        report.summary_data = report_data
+        report.submission_count = len(submissions)
+        report.total_weight = sum(submission['weight'] for submission in submissions)
+        report.artifact = store_artifact(submissions, ReportArtifact, ReportArtifactChunk, db_alias)
+        report.save(update_fields=['summary_data', 'submission_count', 'total_weight', 'artifact'])
+
+
+def restore_report_data(apps, schema_editor):
+    # Put the submissions back into report_data, in member id order
+    VotingReport = apps.get_model('ballot', 'VotingReport')
+    ReportArtifactChunk = apps.get_model('ballot', 'ReportArtifactChunk')
+    db_alias = schema_editor.connection.alias
+
+    for report in VotingReport.objects.using(db_alias).select_related('artifact').iterator(chunk_size=1):
+        submissions = []
+        if report.artifact is not None:
+            chunks = ReportArtifactChunk.objects.using(db_alias).filter(artifact=report.artifact).order_by('sequence')
+            for chunk in chunks.iterator(chunk_size=1):
+                submissions += [json.loads(line) for line in decompress(chunk.data, report.artifact.encoding).splitlines()]
+        report.report_data = dict(report.summary_data, submissions=submissions)
+        report.save(update_fields=['report_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0007_votingevent_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('encoding', models.CharField(choices=[('gzip', 'gzip'), ('zstd', 'Zstandard')], max_length=10)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('compressed_size', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='votingreport',
+            name='submission_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='votingreport',
+            name='summary_data',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='votingreport',
+            name='total_weight',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='votingreport',
+            name='artifact',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='reports', to='ballot.reportartifact'),
+        ),
+        migrations.CreateModel(
+            name='ReportArtifactChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('first_member_id', models.BigIntegerField()),
+                ('last_member_id', models.BigIntegerField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('artifact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='ballot.reportartifact')),
+            ],
+            options={
+                'ordering': ['artifact', 'sequence'],
+                'indexes': [models.Index(fields=['artifact', 'last_member_id'], name='ballot_chunk_member_idx')],
+                'unique_together': {('artifact', 'sequence')},
+            },
+        ),
+        # Nullable while the data moves, so the reverse can add the column back before refilling it
+        migrations.AlterField(
+            model_name='votingreport',
+            name='report_data',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(move_report_data, restore_report_data),
+        migrations.RemoveField(
+            model_name='votingreport',
+            name='report_data',
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def lowercase_emails(apps, schema_editor):
+    """
+    Store member emails in lower case, as ballot.models.normalize_email() does from now on.
+    Members whose emails only differ in case are left alone: merging them is up to an admin, and
+    the roll import reports them instead of picking one.
+    """
+    Member = apps.get_model('ballot', 'Member')
+    members = Member.objects.using(schema_editor.connection.alias)
+
+    seen, clashing = set(), set()
+    for email in members.values_list('email', flat=True).iterator(chunk_size=BATCH_SIZE):
+        normalized = email.strip().lower()
+        if normalized in seen:
+            clashing.add(normalized)
+        seen.add(normalized)
+
+    batch = []
+    for pk, email in members.order_by('pk').values_list('pk', 'email').iterator(chunk_size=BATCH_SIZE):
+        normalized = email.strip().lower()
+        if normalized != email and normalized not in clashing:
+            batch.append(Member(pk=pk, email=normalized))
+        if len(batch) == BATCH_SIZE:
+            members.bulk_update(batch, ['email'])
+            batch = []
+    members.bulk_update(batch, ['email'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0008_report_artifacts'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
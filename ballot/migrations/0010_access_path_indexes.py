@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ballot', '0009_normalize_member_emails'),
+    ]
+
+    operations = [
+        # Submissions and invitations are listed per event, newest first
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['voting_event', 'created_at'], name='ballot_sub_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='votingeventinvitation',
+            index=models.Index(fields=['voting_event', 'created_at'], name='ballot_inv_event_created_idx'),
+        ),
+        # Turnout counts the used invitations of an event
+        migrations.AddIndex(
+            model_name='votingeventinvitation',
+            index=models.Index(fields=['voting_event', 'used_at'], name='ballot_inv_event_used_idx'),
+        ),
+        # Outstanding invitations of an event; shrinks as members vote
+        migrations.AddIndex(
+            model_name='votingeventinvitation',
+            index=models.Index(
+                condition=models.Q(('used_at__isnull', True)), fields=['voting_event'], name='ballot_inv_unused_idx'
+            ),
+        ),
+    ]
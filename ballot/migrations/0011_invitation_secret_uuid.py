@@ -0,0 +1,86 @@
+import uuid
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# Copy of ballot.models.LEGACY_SECRET_NAMESPACE and secret_for_token(), so later changes to the
+# model module can't change the values this migration stores
+LEGACY_SECRET_NAMESPACE = uuid.UUID('5b1f3c2e-8a47-4d0e-9c36-2f0d7a9e4b61')
+
+
+def secret_for_token(token):
+    try:
+        return uuid.UUID(token)
+    except ValueError:
+        return uuid.uuid5(LEGACY_SECRET_NAMESPACE, token)
+
+
+def secrets_to_uuids(apps, schema_editor):
+    """
+    Parse the string secrets into the new UUID column. Secrets that aren't UUIDs get the
+    name-based UUID secret_for_token() derives from them, so their voting links keep working.
+    """
+    VotingEventInvitation = apps.get_model('ballot', 'VotingEventInvitation')
+    invitations = VotingEventInvitation.objects.using(schema_editor.connection.alias)
+
+    batch = []
+    for pk, secret in invitations.order_by('pk').values_list('pk', 'secret').iterator(chunk_size=BATCH_SIZE):
+        batch.append(VotingEventInvitation(pk=pk, secret_uuid=secret_for_token(secret)))
+        if len(batch) == BATCH_SIZE:
+            invitations.bulk_update(batch, ['secret_uuid'])
+            batch = []
+    invitations.bulk_update(batch, ['secret_uuid'])
+
+
+def uuids_to_secrets(apps, schema_editor):
+    VotingEventInvitation = apps.get_model('ballot', 'VotingEventInvitation')
+    invitations = VotingEventInvitation.objects.using(schema_editor.connection.alias)
+
+    batch = []
+    for pk, secret_uuid in invitations.order_by('pk').values_list('pk', 'secret_uuid').iterator(chunk_size=BATCH_SIZE):
+        batch.append(VotingEventInvitation(pk=pk, secret=str(secret_uuid)))
+        if len(batch) == BATCH_SIZE:
+            invitations.bulk_update(batch, ['secret'])
+            batch = []
+    invitations.bulk_update(batch, ['secret'])
+
+
+class Migration(migrations.Migration):
+    """
+    Store invitation secrets as UUIDs (native uuid on PostgreSQL, 32 hex characters elsewhere)
+    instead of 64 character strings. The values move through a temporary column, and the old
+    column loses its constraints before it is dropped, so the migration can be reversed.
+    """
+
+    dependencies = [
+        ('ballot', '0010_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='votingeventinvitation',
+            name='secret_uuid',
+            field=models.UUIDField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='votingeventinvitation',
+            name='secret',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(secrets_to_uuids, uuids_to_secrets),
+        migrations.RemoveField(
+            model_name='votingeventinvitation',
+            name='secret',
+        ),
+        migrations.RenameField(
+            model_name='votingeventinvitation',
+            old_name='secret_uuid',
+            new_name='secret',
+        ),
+        migrations.AlterField(
+            model_name='votingeventinvitation',
+            name='secret',
+            field=models.UUIDField(default=uuid.uuid4, unique=True),
+        ),
+    ]
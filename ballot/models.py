@@ -1,15 +1,30 @@
 from django.db import models
 from django.core.validators import MinValueValidator
-from django.utils.crypto import get_random_string
-import json
+from django.utils import timezone
 import uuid
 
 
+def normalize_email(email):
+    """
+    Return the spelling member emails are stored and matched in. Emails are compared in lower case
+    throughout, as the roll import matches them case-insensitively and Member.email is unique.
+    """
+    return email.strip().lower()
+
+
 class Member(models.Model):
     name = models.CharField(max_length=200)
     email = models.EmailField(unique=True)
     membership_weight = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     
+    def clean(self):
+        # Runs before the unique check of model forms, so 'ADA@example.org' clashes with 'ada@example.org'
+        self.email = normalize_email(self.email)
+    
+    def save(self, *args, **kwargs):
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.name} ({self.email})"
     
@@ -29,6 +44,12 @@ class VotingEvent(models.Model):
     state = models.CharField(max_length=10, choices=STATE_CHOICES, default='closed')
     members = models.ManyToManyField(Member, related_name='voting_events', blank=True)
     
+    # Precomputed counters for the admin changelist, refreshed by ballot.counters
+    member_total = models.PositiveIntegerField(default=0, editable=False)
+    vote_total = models.PositiveIntegerField(default=0, editable=False)
+    submission_total = models.PositiveIntegerField(default=0, editable=False)
+    totals_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
     def __str__(self):
         return self.title
     
@@ -69,18 +90,55 @@ class Submission(models.Model):
     class Meta:
         unique_together = ['voting_event', 'member']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['voting_event', 'created_at'], name='ballot_sub_event_created_idx'),
+        ]
+
+
+class SubmissionAnswer(models.Model):
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name='answers')
+    vote = models.ForeignKey(Vote, on_delete=models.CASCADE, related_name='answers')
+    value = models.TextField()
+    weight = models.PositiveIntegerField()
+    
+    def __str__(self):
+        return f"{self.vote.title}: {self.value}"
+    
+    class Meta:
+        unique_together = ['submission', 'vote']
+        indexes = [
+            models.Index(fields=['vote', 'value'], name='ballot_answer_vote_value_idx'),
+        ]
+
+
+# Namespace of the name-based UUIDs that replaced invitation secrets which weren't UUIDs
+LEGACY_SECRET_NAMESPACE = uuid.UUID('5b1f3c2e-8a47-4d0e-9c36-2f0d7a9e4b61')
+
+
+def secret_for_token(token):
+    """
+    Return the invitation secret a voting token refers to. Tokens are UUIDs in any spelling
+    Python accepts; legacy tokens that aren't map to uuid5(LEGACY_SECRET_NAMESPACE, token), the
+    value migration 0011 stored for them, so old voting links keep working.
+    """
+    if isinstance(token, uuid.UUID):
+        return token
+    try:
+        return uuid.UUID(token)
+    except ValueError:
+        return uuid.uuid5(LEGACY_SECRET_NAMESPACE, token)
 
 
 class VotingEventInvitation(models.Model):
     voting_event = models.ForeignKey(VotingEvent, on_delete=models.CASCADE, related_name='invitations')
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='invitations')
-    secret = models.CharField(max_length=64, unique=True, default=uuid.uuid4)
+    secret = models.UUIDField(unique=True, default=uuid.uuid4)
     created_at = models.DateTimeField(auto_now_add=True)
     used_at = models.DateTimeField(null=True, blank=True)
     
     def save(self, *args, **kwargs):
         if not self.secret:
-            self.secret = str(uuid.uuid4())
+            self.secret = uuid.uuid4()
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -89,11 +147,84 @@ class VotingEventInvitation(models.Model):
     class Meta:
         unique_together = ['voting_event', 'member']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['voting_event', 'created_at'], name='ballot_inv_event_created_idx'),
+            models.Index(fields=['voting_event', 'used_at'], name='ballot_inv_event_used_idx'),
+            models.Index(
+                fields=['voting_event'], condition=models.Q(used_at__isnull=True), name='ballot_inv_unused_idx'
+            ),
+        ]
+
+
+class InvitationEmail(models.Model):
+    STATE_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    invitation = models.OneToOneField(VotingEventInvitation, on_delete=models.CASCADE, related_name='email')
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.invitation} ({self.get_state_display()})"
+    
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['state', 'next_attempt_at'], name='ballot_email_due_idx'),
+        ]
+
+
+class ReportArtifact(models.Model):
+    ENCODING_CHOICES = [
+        ('gzip', 'gzip'),
+        ('zstd', 'Zstandard'),
+    ]
+    
+    content_hash = models.CharField(max_length=64, unique=True)
+    encoding = models.CharField(max_length=10, choices=ENCODING_CHOICES)
+    row_count = models.PositiveIntegerField(default=0)
+    compressed_size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.row_count} rows)"
+    
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ReportArtifactChunk(models.Model):
+    artifact = models.ForeignKey(ReportArtifact, on_delete=models.CASCADE, related_name='chunks')
+    sequence = models.PositiveIntegerField()
+    first_member_id = models.BigIntegerField()
+    last_member_id = models.BigIntegerField()
+    row_count = models.PositiveIntegerField()
+    data = models.BinaryField()
+    
+    def __str__(self):
+        return f"{self.artifact} #{self.sequence}"
+    
+    class Meta:
+        unique_together = ['artifact', 'sequence']
+        ordering = ['artifact', 'sequence']
+        indexes = [
+            models.Index(fields=['artifact', 'last_member_id'], name='ballot_chunk_member_idx'),
+        ]
 
 
 class VotingReport(models.Model):
     voting_event = models.ForeignKey(VotingEvent, on_delete=models.CASCADE, related_name='reports')
-    report_data = models.JSONField()
+    summary_data = models.JSONField(default=dict)
+    submission_count = models.PositiveIntegerField(default=0)
+    total_weight = models.PositiveBigIntegerField(default=0)
+    artifact = models.ForeignKey(ReportArtifact, on_delete=models.PROTECT, null=True, blank=True, related_name='reports')
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -101,3 +232,18 @@ class VotingReport(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+
+
+class VoteTally(models.Model):
+    voting_event = models.ForeignKey(VotingEvent, on_delete=models.CASCADE, related_name='tallies')
+    vote = models.ForeignKey(Vote, on_delete=models.CASCADE, related_name='tallies')
+    answer = models.TextField()
+    count = models.PositiveIntegerField(default=0)
+    weighted = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.vote.title} - {self.answer}: {self.count}"
+    
+    class Meta:
+        unique_together = ['voting_event', 'vote', 'answer']
+        ordering = ['vote', 'answer']
@@ -0,0 +1,278 @@
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Sum
+
+from .answers import summarize_answers
+from .artifacts import ArtifactBuilder, store_artifact
+from .models import Member, ReportArtifact, ReportArtifactChunk, Submission, VotingReport
+from .routers import use_replica
+from .tallies import summarize_tallies
+from .tally_engine import TallyEngine, turnout
+from .text_answers import fold_short_text_answers
+
+
+# Rows fetched per round trip while streaming submissions; on PostgreSQL this is the
+# fetch size of the server-side cursor, so memory stays flat regardless of turnout.
+REPORT_CHUNK_SIZE = 2000
+
+SUMMARY_MODES = ('tallies', 'answers', 'database', 'python', 'vectorized')
+
+
+def create_voting_report(voting_event, summary_mode=None):
+    """
+    Generate and save a VotingReport for a voting event.
+    Only the header, vote structure and summary are stored in the report row. The submissions are
+    streamed once, in member id order, into compressed chunks of a ReportArtifact that is shared by
+    every report with identical submissions, so regenerating an unchanged report stores nothing new.
+    The summary is taken from the live tally table ('tallies'), grouped from the normalized
+    answer table ('answers'), aggregated from the submission JSON by the database ('database',
+    PostgreSQL only, other backends fall back to 'python') or accumulated while streaming the
+    submissions, either in dicts ('python') or in the array based tally engine ('vectorized'),
+    which counts with NumPy only if it is installed; it is optional and not in requirements.txt.
+    """
+    builder = ArtifactBuilder()
+
+    # All the reads, which is most of the work, can run on the read replica, if there is one
+    with use_replica():
+        summary_mode = _resolve_summary_mode(summary_mode)
+        accumulator = _accumulator(summary_mode)
+        for member_id, email, weight, votes in iter_submission_rows(voting_event, order_by='member_id'):
+            builder.add(member_id, email, weight, votes)
+            accumulator.add(votes, weight)
+
+        summary_data = _report_header(voting_event)
+        summary_data["summary"] = fold_text_answers(
+            _summarize(voting_event, summary_mode, accumulator), summary_data["votes"]
+        )
+        summary_data["turnout"] = event_turnout(voting_event, builder.row_count, builder.total_weight)
+
+    with transaction.atomic():
+        artifact, _ = store_artifact(builder, ReportArtifact, ReportArtifactChunk)
+        return VotingReport.objects.create(
+            voting_event=voting_event,
+            summary_data=summary_data,
+            submission_count=builder.row_count,
+            total_weight=builder.total_weight,
+            artifact=artifact
+        )
+
+
+def _resolve_summary_mode(summary_mode):
+    summary_mode = summary_mode or getattr(settings, 'BALLOT_REPORT_SUMMARY_MODE', 'tallies')
+    if summary_mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode {summary_mode!r}, expected one of {', '.join(SUMMARY_MODES)}")
+
+    if summary_mode == 'database' and not _supports_database_aggregation():
+        summary_mode = 'python'
+    return summary_mode
+
+
+def _report_header(voting_event):
+    return {
+        "Id": str(voting_event.id),
+        "voting_event_id": str(voting_event.id),
+        "title": voting_event.title,
+        "votes": build_vote_structure(voting_event),
+    }
+
+
+class _DictAccumulator:
+    """Accumulates the summary in nested dicts while submissions are streamed ('python' mode)."""
+
+    def __init__(self):
+        self.vote_summaries = {}
+
+    def add(self, votes, weight):
+        _accumulate(self.vote_summaries, votes, weight)
+
+    def summary(self):
+        return self.vote_summaries
+
+
+class _NoAccumulator:
+    """For modes that summarize in the database or from the tally tables."""
+
+    def add(self, votes, weight):
+        pass
+
+
+def _accumulator(summary_mode):
+    """
+    Object fed with (votes, weight) of every streamed submission through add().
+    """
+    if summary_mode == 'vectorized':
+        return TallyEngine()
+    if summary_mode == 'python':
+        return _DictAccumulator()
+    return _NoAccumulator()
+
+
+def _summarize(voting_event, summary_mode, accumulator):
+    """
+    The report summary for the resolved mode; streamed modes read it from the accumulator.
+    """
+    if summary_mode == 'tallies':
+        return summarize_tallies(voting_event)
+    elif summary_mode == 'answers':
+        return summarize_answers(voting_event)
+    elif summary_mode == 'database':
+        return aggregate_in_database(voting_event)
+    return accumulator.summary()
+
+
+def fold_text_answers(summary, votes):
+    """
+    Group the answers of short_text votes by normal form (and similarity, if enabled) and keep
+    the top BALLOT_SHORT_TEXT_TOP_K of them, so the summary stays small however varied the input.
+    """
+    return fold_short_text_answers(
+        summary,
+        votes,
+        top_k=getattr(settings, 'BALLOT_SHORT_TEXT_TOP_K', 20),
+        fuzzy=getattr(settings, 'BALLOT_SHORT_TEXT_FUZZY', False),
+        threshold=getattr(settings, 'BALLOT_SHORT_TEXT_SIMILARITY', 0.6)
+    )
+
+
+def event_turnout(voting_event, submissions, submitted_weight):
+    """
+    Turnout and quorum figures for a voting event, against the members currently on its roll.
+    The quorum is a share of the eligible membership weight taken from BALLOT_REPORT_QUORUM.
+    """
+    eligible = voting_event.members.aggregate(members=Count('pk'), weight=Sum('membership_weight'))
+    return turnout(
+        submissions,
+        submitted_weight,
+        eligible['members'],
+        eligible['weight'] or 0,
+        quorum=getattr(settings, 'BALLOT_REPORT_QUORUM', None)
+    )
+
+
+def build_vote_structure(voting_event):
+    """
+    Describe the votes (questions) of a voting event the way they appear in a report.
+    """
+    votes = []
+    for vote in voting_event.votes.all():
+        vote_data = {
+            "id": str(vote.id),
+            "type": vote.vote_type,
+            "title": vote.title,
+            "description": vote.description,
+        }
+
+        if vote.vote_type == 'simple':
+            vote_data["options"] = [
+                {"id": "agree", "label": "Agree"},
+                {"id": "disagree", "label": "Disagree"},
+                {"id": "abstain", "label": "Abstain"}
+            ]
+        elif vote.vote_type == 'short_text':
+            vote_data["default_value"] = vote.type_specific_data.get('default_value', '')
+        elif vote.vote_type == 'radio':
+            vote_data["options"] = vote.type_specific_data.get('options', [])
+
+        votes.append(vote_data)
+    return votes
+
+
+def iter_submission_rows(voting_event, chunk_size=REPORT_CHUNK_SIZE, order_by=None):
+    """
+    Stream (member_id, member_email, weight, submission_data) tuples for a voting event.
+    The member columns are joined in the same query, so no per-row lookups happen. Rows come in
+    the default submission ordering unless order_by is given; 'member_id' is served by the
+    (voting_event, member) unique index.
+    """
+    rows = Submission.objects.filter(voting_event=voting_event).values_list(
+        'member_id', 'member__email', 'member__membership_weight', 'submission_data'
+    )
+    if order_by:
+        rows = rows.order_by(order_by)
+    return rows.iterator(chunk_size=chunk_size)
+
+
+def _accumulate(vote_summaries, votes, weight):
+    for vote_key, vote_value in votes.items():
+        vote_summary = vote_summaries.setdefault(vote_key, {"count": {}, "weighted": {}})
+        vote_summary["count"][vote_value] = vote_summary["count"].get(vote_value, 0) + 1
+        vote_summary["weighted"][vote_value] = vote_summary["weighted"].get(vote_value, 0) + weight
+
+
+def _supports_database_aggregation():
+    alias = router.db_for_read(Submission)
+    return connections[alias].vendor == 'postgresql'
+
+
+def aggregate_in_database(voting_event):
+    """
+    Compute the report summary with a single GROUP BY over the submission JSON on PostgreSQL.
+    jsonb_each_text expands every submission into (vote_id, answer) pairs, which are then
+    counted and weighted by the joined member weight without leaving the database.
+    """
+    alias = router.db_for_read(Submission)
+    sql = f"""
+        SELECT answers.key, answers.value, COUNT(*), SUM(member.membership_weight)
+        FROM {Submission._meta.db_table} AS submission
+        JOIN {Member._meta.db_table} AS member ON member.id = submission.member_id
+        CROSS JOIN LATERAL jsonb_each_text(submission.submission_data) AS answers
+        WHERE submission.voting_event_id = %s
+        GROUP BY answers.key, answers.value
+        ORDER BY answers.key, answers.value
+    """
+
+    vote_summaries = {}
+    with connections[alias].cursor() as cursor:
+        cursor.execute(sql, [voting_event.pk])
+        for vote_key, vote_value, count, weighted in cursor.fetchall():
+            vote_summary = vote_summaries.setdefault(vote_key, {"count": {}, "weighted": {}})
+            vote_summary["count"][vote_value] = count
+            vote_summary["weighted"][vote_value] = int(weighted)
+    return vote_summaries
+
+
+def summary_tables(summary_data):
+    """
+    Flatten a stored report summary into one table per vote for display:
+    [{'vote': vote, 'rows': [{'answer', 'label', 'count', 'weighted', 'percent', 'weighted_percent'}],
+    'count': total, 'weighted': total}]. Options of simple and radio votes are listed even when
+    nobody chose them; other answers follow in descending order of their weighted result, and
+    the "other" bucket of a truncated short_text vote comes last.
+    """
+    tables = []
+    summary = summary_data.get('summary', {})
+    for vote in summary_data.get('votes', []):
+        vote_summary = summary.get(vote['id'], {"count": {}, "weighted": {}})
+        counts, weights = dict(vote_summary["count"]), dict(vote_summary["weighted"])
+        other = vote_summary.get("other")
+        total_count = sum(counts.values()) + (other["count"] if other else 0)
+        total_weighted = sum(weights.values()) + (other["weighted"] if other else 0)
+
+        labels = {}
+        for option in vote.get('options', []):
+            if isinstance(option, dict):
+                labels[option['id']] = option['label']
+            else:
+                labels[option] = option
+        answers = list(labels) + sorted(
+            (answer for answer in counts if answer not in labels),
+            key=lambda answer: (-weights.get(answer, 0), answer)
+        )
+        if other:
+            answers.append(None)
+            labels[None] = f'Other ({other["answers"]} answers)'
+            counts[None], weights[None] = other["count"], other["weighted"]
+
+        rows = []
+        for answer in answers:
+            count, weighted = counts.get(answer, 0), weights.get(answer, 0)
+            rows.append({
+                'answer': answer,
+                'label': labels.get(answer, answer),
+                'count': count,
+                'weighted': weighted,
+                'percent': 100 * count / total_count if total_count else 0,
+                'weighted_percent': 100 * weighted / total_weighted if total_weighted else 0,
+            })
+        tables.append({'vote': vote, 'rows': rows, 'count': total_count, 'weighted': total_weighted})
+    return tables
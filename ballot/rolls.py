@@ -0,0 +1,307 @@
+import csv
+import time
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connections, router, transaction
+from django.db.models import Exists, F, OuterRef
+from django.db.models.functions import Lower
+
+from .counters import refresh_event_totals
+from .models import Member, VotingEvent, normalize_email
+
+
+ROLL_BATCH_SIZE = 1000
+
+# Accepted header spellings for the weight column
+WEIGHT_COLUMNS = ('membership_weight', 'weight')
+
+RollRow = namedtuple('RollRow', ['line', 'email', 'name', 'weight'])
+
+RollDiff = namedtuple('RollDiff', ['create', 'update', 'unchanged', 'errors', 'member_ids'])
+
+RollSyncResult = namedtuple(
+    'RollSyncResult', ['created', 'updated', 'unchanged', 'errors', 'attached', 'detached', 'timings', 'diff']
+)
+
+
+class RollError(Exception):
+    """The roll file can't be read at all (e.g. missing columns)."""
+
+
+def read_roll(lines):
+    """
+    Stream RollRow tuples from CSV text lines with an email, name and membership_weight (or
+    weight) column, with emails normalised by normalize_email(). Rows that don't validate are
+    yielded as (line, error) pairs instead.
+    """
+    reader = csv.DictReader(lines)
+    columns = {(column or '').strip().lower(): column for column in reader.fieldnames or []}
+    weight_column = next((columns[name] for name in WEIGHT_COLUMNS if name in columns), None)
+    if 'email' not in columns or 'name' not in columns or weight_column is None:
+        raise RollError("The roll needs email, name and membership_weight (or weight) columns.")
+
+    for record in reader:
+        line = reader.line_num
+        email = normalize_email(record[columns['email']] or '')
+        name = (record[columns['name']] or '').strip()
+        try:
+            validate_email(email)
+            weight = int(record[weight_column])
+            if weight < 1:
+                raise ValueError
+        except ValidationError:
+            yield line, f"invalid email {email!r}"
+            continue
+        except (TypeError, ValueError):
+            yield line, f"invalid membership weight {record[weight_column]!r}"
+            continue
+        if not name:
+            yield line, "missing name"
+            continue
+        yield RollRow(line, email, name, weight)
+
+
+def _legacy_spellings():
+    """
+    Existing members whose stored email isn't normalised (kept by migration 0009 because another
+    member has the same email in a different case), as {normalised email: [(id, name, weight)]}.
+    """
+    legacy = {}
+    members = Member.objects.exclude(email=Lower('email')).values_list('id', 'email', 'name', 'membership_weight')
+    for member_id, email, name, weight in members:
+        legacy.setdefault(normalize_email(email), []).append((member_id, name, weight))
+    return legacy
+
+
+def iter_roll_diff(rows, batch_size=ROLL_BATCH_SIZE):
+    """
+    Compare a stream of roll rows with the existing members, matched case-insensitively by email,
+    and yield one RollDiff per batch of batch_size rows. Each batch looks its members up with one
+    indexed email IN (...) query on the normalised emails, so neither the roll nor the members are
+    held in memory as a whole. Rows matching several members whose emails only differ in case
+    (stored before emails were normalised) are reported as errors rather than guessed.
+    """
+    legacy = _legacy_spellings()
+    seen = {}
+
+    def diff_batch(batch, errors):
+        existing = {}
+        for member_id, email, name, weight in Member.objects.filter(
+            email__in=[row.email for row in batch]
+        ).values_list('id', 'email', 'name', 'membership_weight'):
+            existing.setdefault(email, []).append((member_id, name, weight))
+
+        create, update, member_ids = [], [], []
+        unchanged = 0
+        for row in batch:
+            matches = existing.get(row.email, []) + legacy.get(row.email, [])
+            if len(matches) > 1:
+                errors.append((row.line, f"several members have the email {row.email} in different cases"))
+                continue
+            if not matches:
+                create.append(Member(email=row.email, name=row.name, membership_weight=row.weight))
+                continue
+            member_id, name, weight = matches[0]
+            member_ids.append(member_id)
+            if (name, weight) == (row.name, row.weight):
+                unchanged += 1
+            else:
+                update.append(Member(id=member_id, email=row.email, name=row.name, membership_weight=row.weight))
+        errors.sort()
+        return RollDiff(create, update, unchanged, errors, member_ids)
+
+    batch, errors = [], []
+    for row in rows:
+        if not isinstance(row, RollRow):
+            errors.append(row)
+            continue
+        if row.email in seen:
+            errors.append((row.line, f"duplicate of line {seen[row.email]} ({row.email})"))
+            continue
+        seen[row.email] = row.line
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield diff_batch(batch, errors)
+            batch, errors = [], []
+    if batch or errors:
+        yield diff_batch(batch, errors)
+
+
+def diff_roll(rows, batch_size=ROLL_BATCH_SIZE):
+    """
+    The batches of iter_roll_diff() merged into one RollDiff of Member objects to create, Member
+    objects to update, the number of unchanged members, (line, message) errors and the ids of
+    existing members on the roll.
+    """
+    create, update, errors, member_ids = [], [], [], []
+    unchanged = 0
+    for diff in iter_roll_diff(rows, batch_size):
+        create += diff.create
+        update += diff.update
+        unchanged += diff.unchanged
+        errors += diff.errors
+        member_ids += diff.member_ids
+    return RollDiff(create, update, unchanged, errors, member_ids)
+
+
+def attach_members(voting_event, member_ids, replace=False, batch_size=ROLL_BATCH_SIZE):
+    """
+    Put members on the roll of a voting event by inserting into the many-to-many through table
+    directly, skipping the ones already on it. With replace, members not in member_ids are taken
+    off the roll in batched DELETEs. Returns (attached, detached). Bulk writes to the through table
+    bypass m2m_changed, so the event's precomputed member counter is refreshed here.
+    """
+    through = VotingEvent.members.through
+    on_roll = set(through.objects.filter(votingevent_id=voting_event.pk).values_list('member_id', flat=True))
+    wanted = set(member_ids)
+
+    missing = sorted(wanted - on_roll)
+    for offset in range(0, len(missing), batch_size):
+        through.objects.bulk_create(
+            [
+                through(votingevent_id=voting_event.pk, member_id=member_id)
+                for member_id in missing[offset:offset + batch_size]
+            ],
+            ignore_conflicts=True
+        )
+
+    detached = 0
+    if replace:
+        stale = sorted(on_roll - wanted)
+        for offset in range(0, len(stale), batch_size):
+            deleted, _ = through.objects.filter(
+                votingevent_id=voting_event.pk, member_id__in=stale[offset:offset + batch_size]
+            ).delete()
+            detached += deleted
+
+    refresh_event_totals(VotingEvent.objects.filter(pk=voting_event.pk))
+    return len(missing), detached
+
+
+def sync_roll(lines, voting_event=None, replace=False, dry_run=False, batch_size=ROLL_BATCH_SIZE):
+    """
+    Import a member roll from CSV lines: create new members, update the name and weight of
+    changed ones, and optionally put everyone on the roll of a voting event (replace also removes
+    members missing from the file, which RollError refuses for an open event). The file is read,
+    diffed and written in batches of batch_size rows, all in one transaction. With dry_run nothing
+    is written and the counts say what would happen. Returns a RollSyncResult whose timings map
+    each phase to elapsed seconds; its diff holds the merged RollDiff to print the changes of a dry
+    run, and is None otherwise.
+    """
+    if replace and voting_event is not None and voting_event.state == 'open':
+        raise RollError(f"{voting_event} is open for voting; close it before replacing its roll.")
+
+    timings = {}
+    rows = read_roll(lines)
+
+    if dry_run:
+        started = time.monotonic()
+        diff = diff_roll(rows, batch_size)
+        timings['diff'] = time.monotonic() - started
+
+        on_roll = set()
+        if voting_event is not None:
+            on_roll = set(voting_event.members.values_list('id', flat=True))
+        attached = len(diff.create) + len(set(diff.member_ids) - on_roll)
+        detached = len(on_roll - set(diff.member_ids)) if (voting_event is not None and replace) else 0
+        return RollSyncResult(
+            len(diff.create), len(diff.update), diff.unchanged, diff.errors,
+            attached if voting_event is not None else 0, detached, timings, diff
+        )
+
+    created = updated = unchanged = 0
+    errors, member_ids = [], []
+    with transaction.atomic():
+        batches = iter_roll_diff(rows, batch_size)
+        while True:
+            started = time.monotonic()
+            diff = next(batches, None)
+            timings['diff'] = timings.get('diff', 0) + time.monotonic() - started
+            if diff is None:
+                break
+            errors += diff.errors
+            unchanged += diff.unchanged
+            member_ids += diff.member_ids
+
+            started = time.monotonic()
+            new_members = Member.objects.bulk_create(diff.create, batch_size=batch_size)
+            created += len(new_members)
+            if voting_event is not None:
+                # bulk_create only sets primary keys on some backends; look the new members up by email
+                new_ids = [member.pk for member in new_members if member.pk is not None]
+                if len(new_ids) != len(new_members):
+                    new_ids = Member.objects.filter(
+                        email__in=[member.email for member in new_members]
+                    ).values_list('id', flat=True)
+                member_ids += new_ids
+            timings['create'] = timings.get('create', 0) + time.monotonic() - started
+
+            started = time.monotonic()
+            Member.objects.bulk_update(diff.update, ['name', 'membership_weight'], batch_size=batch_size)
+            updated += len(diff.update)
+            timings['update'] = timings.get('update', 0) + time.monotonic() - started
+
+        attached = detached = 0
+        if voting_event is not None:
+            started = time.monotonic()
+            attached, detached = attach_members(voting_event, member_ids, replace=replace, batch_size=batch_size)
+            timings['attach'] = time.monotonic() - started
+
+    return RollSyncResult(created, updated, unchanged, errors, attached, detached, timings, None)
+
+
+def _insert_member_ids(voting_event, member_ids):
+    """
+    INSERT ... SELECT the member ids selected by a values('id') style queryset into the roll of a
+    voting event, as one statement that never moves the ids through Python. Returns the row count.
+    """
+    through = VotingEvent.members.through
+    connection = connections[router.db_for_write(through)]
+    table = connection.ops.quote_name(through._meta.db_table)
+    select_sql, params = member_ids.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (votingevent_id, member_id) SELECT %s, source.member_id "
+            f"FROM ({select_sql}) AS source",
+            (voting_event.pk, *params)
+        )
+        return cursor.rowcount
+
+
+def add_matching_members(voting_event, members):
+    """
+    Put every member of the members queryset that isn't on the roll yet on the roll of a voting
+    event, with one set-based INSERT ... SELECT. Returns the number of members added.
+    """
+    through = VotingEvent.members.through
+    missing = members.exclude(
+        Exists(through.objects.filter(votingevent_id=voting_event.pk, member_id=OuterRef('pk')))
+    ).order_by().values(member_id=F('pk'))
+    with transaction.atomic():
+        added = _insert_member_ids(voting_event, missing)
+        refresh_event_totals(VotingEvent.objects.filter(pk=voting_event.pk))
+    return added
+
+
+def copy_roll(voting_event, source_event):
+    """
+    Add the whole roll of source_event to the roll of voting_event with one INSERT ... SELECT.
+    Returns the number of members added.
+    """
+    return add_matching_members(voting_event, Member.objects.filter(voting_events=source_event))
+
+
+def remove_members(voting_event, members):
+    """
+    Take the members of the members queryset off the roll of a voting event with one DELETE.
+    Returns the number of members removed.
+    """
+    through = VotingEvent.members.through
+    with transaction.atomic():
+        removed, _ = through.objects.filter(
+            votingevent_id=voting_event.pk, member_id__in=members.order_by().values('pk')
+        ).delete()
+        refresh_event_totals(VotingEvent.objects.filter(pk=voting_event.pk))
+    return removed
@@ -0,0 +1,130 @@
+"""
+Read/write routing between the primary database and an optional read replica.
+
+Nothing reads from the replica unless asked to: reporting code runs inside use_replica() (or a
+view decorated with replica_reads), and only then are reads sent to the BALLOT_REPLICA_ALIAS
+database, if it is configured. Writes always go to the primary, and so do reads made inside a
+transaction opened within the use_replica() block, which may depend on what it wrote. A
+transaction that was already open when the block was entered doesn't count: entering
+use_replica() states that the reads of the block don't depend on it. Voter views never read from
+the replica, so their already-voted checks always see the latest state.
+
+After an admin writes something they will look at right away (e.g. generating a report), call
+stick_to_primary() so that their replica_reads views use the primary for a few seconds, until
+the replica has caught up.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# None outside use_replica(), else the depth of the primary's atomic blocks when it was entered
+_use_replica = contextvars.ContextVar('ballot_use_replica', default=None)
+
+STICKY_SESSION_KEY = 'ballot_primary_until'
+
+
+def replica_alias():
+    """
+    The alias of the read replica, or None when no replica is configured.
+    """
+    alias = getattr(settings, 'BALLOT_REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """
+    Send the reads of the block to the replica, or, with enabled=False, back to the primary.
+    """
+    token = _use_replica.set(len(connections[DEFAULT_DB_ALIAS].atomic_blocks) if enabled else None)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def keep_routing(iterable):
+    """
+    Iterate a lazy iterable, e.g. the rows of a streaming export, with the replica setting that is
+    current now. Streaming responses are consumed after the view has returned, outside of its
+    use_replica() block.
+    """
+    return _iterate_with_routing(iter(iterable), _use_replica.get())
+
+
+def _iterate_with_routing(iterator, depth):
+    while True:
+        token = _use_replica.set(depth)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _use_replica.reset(token)
+        yield item
+
+
+def stick_to_primary(request):
+    """
+    Make the replica_reads views of this session read from the primary for
+    BALLOT_REPLICA_STICKY_SECONDS, so they see what the session just wrote.
+    """
+    request.session[STICKY_SESSION_KEY] = time.time() + getattr(settings, 'BALLOT_REPLICA_STICKY_SECONDS', 10)
+
+
+def _sticks_to_primary(request):
+    session = getattr(request, 'session', None)
+    return session is not None and session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def replica_reads(view):
+    """
+    View decorator sending the reads of GET requests to the replica, unless the session has just
+    written. Other requests run on the primary and make the session stick to it (see
+    stick_to_primary). Use method_decorator() on ModelAdmin methods.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if replica_alias() is None:
+            return view(request, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD'):
+            response = view(request, *args, **kwargs)
+            stick_to_primary(request)
+            return response
+        if _sticks_to_primary(request):
+            return view(request, *args, **kwargs)
+        with use_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to the replica inside use_replica() and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        depth = _use_replica.get()
+        if depth is None or len(connections[DEFAULT_DB_ALIAS].atomic_blocks) > depth:
+            return DEFAULT_DB_ALIAS
+        return replica_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, as objects read from the replica would otherwise be saved back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        if db == replica_alias():
+            return False
+        return None
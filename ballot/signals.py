@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import sqlite, token_cache
+from .caching import invalidate_ballot_definition
+from .counters import refresh_event_totals
+from .models import ReportArtifact, Vote, VotingEvent, VotingReport
+
+
+# Saving a VotingEvent moves its updated_at (auto_now), which already retires its cached ballot
+# definition. Votes live in their own table, so editing one has to bump the event explicitly.
+
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+def vote_changed(sender, instance, **kwargs):
+    invalidate_ballot_definition(instance.voting_event_id)
+    if settings.BALLOT_PRECOMPUTED_COUNTERS:
+        refresh_event_totals(VotingEvent.objects.filter(pk=instance.voting_event_id))
+
+
+@receiver(m2m_changed, sender=VotingEvent.members.through)
+def members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Keep the precomputed member counter in step with edits of the roll
+    if not settings.BALLOT_PRECOMPUTED_COUNTERS:
+        return
+    if not reverse:
+        if action.startswith('post_'):
+            refresh_event_totals(VotingEvent.objects.filter(pk=instance.pk))
+        return
+
+    # Edited from the member side: clearing drops the links, so remember the events beforehand
+    if action == 'pre_clear':
+        instance._cleared_event_ids = list(instance.voting_events.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        refresh_event_totals(VotingEvent.objects.filter(pk__in=getattr(instance, '_cleared_event_ids', [])))
+    elif action.startswith('post_'):
+        refresh_event_totals(VotingEvent.objects.filter(pk__in=pk_set))
+
+
+@receiver(pre_save, sender=VotingEvent)
+def remember_previous_state(sender, instance, **kwargs):
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = VotingEvent.objects.filter(pk=instance.pk).values_list('state', flat=True).first()
+
+
+@receiver(post_save, sender=VotingEvent)
+def voting_event_closed(sender, instance, created, **kwargs):
+    # Drop the cached tokens of an event as soon as it stops being open
+    if getattr(instance, '_previous_state', None) == 'open' and instance.state != 'open':
+        token_cache.evict_event(instance)
+
+
+@receiver(post_delete, sender=VotingReport)
+def report_deleted(sender, instance, **kwargs):
+    # Artifacts are shared between reports with identical submissions; drop one once nothing uses it
+    if instance.artifact_id:
+        ReportArtifact.objects.filter(pk=instance.artifact_id, reports__isnull=True).delete()
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and settings.BALLOT_SQLITE_TUNING:
+        sqlite.apply_pragmas(connection)
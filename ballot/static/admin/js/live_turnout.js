@@ -0,0 +1,62 @@
+document.addEventListener('DOMContentLoaded', function() {
+    'use strict';
+
+    var container = document.querySelector('.live-turnout');
+
+    if (!container || !window.EventSource) {
+        return;
+    }
+
+    function render(snapshot) {
+        var turnout = snapshot.turnout;
+        var lines = [
+            turnout.submissions + ' / ' + turnout.invitations + ' invitations voted (' + turnout.percent + '%)',
+            turnout.submitted_weight + ' / ' + turnout.invited_weight + ' weight (' + turnout.weighted_percent + '%)'
+        ];
+
+        container.textContent = '';
+        lines.forEach(function(line) {
+            var paragraph = document.createElement('p');
+            paragraph.textContent = line;
+            container.appendChild(paragraph);
+        });
+
+        // Live results per vote, most weighted answer first
+        Object.keys(snapshot.tallies || {}).forEach(function(voteId) {
+            var result = snapshot.tallies[voteId];
+            var answers = Object.keys(result.weighted).sort(function(a, b) {
+                return result.weighted[b] - result.weighted[a];
+            });
+            var paragraph = document.createElement('p');
+            paragraph.textContent = 'Vote ' + voteId + ': ' + answers.map(function(answer) {
+                return answer + ' ' + result.count[answer] + ' (' + result.weighted[answer] + ')';
+            }).join(', ');
+            container.appendChild(paragraph);
+        });
+    }
+
+    // The stream is opt-in and ends after a while (holding a server thread under WSGI),
+    // so connect on click and offer to resume once the server has let it expire
+    function showButton(label) {
+        var button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'button live-turnout-start';
+        button.textContent = label;
+        button.addEventListener('click', connect);
+        container.appendChild(button);
+    }
+
+    function connect() {
+        container.textContent = 'Connecting…';
+        var source = new EventSource(container.getAttribute('data-url'));
+        source.addEventListener('turnout', function(event) {
+            render(JSON.parse(event.data));
+        });
+        source.addEventListener('expired', function() {
+            source.close();
+            showButton('Resume live turnout');
+        });
+    }
+
+    container.querySelector('.live-turnout-start').addEventListener('click', connect);
+});
@@ -0,0 +1,55 @@
+document.addEventListener('DOMContentLoaded', function() {
+    'use strict';
+
+    var table = document.getElementById('report-submissions');
+    var button = document.getElementById('report-submissions-more');
+
+    if (!table || !button) {
+        return;
+    }
+
+    var body = table.querySelector('tbody');
+    var voteIds = Array.prototype.map.call(
+        table.querySelectorAll('th[data-vote-id]'),
+        function(header) { return header.getAttribute('data-vote-id'); }
+    );
+    var after = null;
+
+    function appendRow(submission) {
+        var row = document.createElement('tr');
+        var values = [submission.member_id, submission.member_email, submission.weight];
+        voteIds.forEach(function(voteId) {
+            values.push(submission.votes[voteId] || '');
+        });
+        values.forEach(function(value) {
+            var cell = document.createElement('td');
+            cell.textContent = value;
+            row.appendChild(cell);
+        });
+        body.appendChild(row);
+    }
+
+    function loadPage() {
+        // Keyset pagination: ask for the members after the last one shown
+        var url = table.getAttribute('data-url') + '?limit=' + table.getAttribute('data-page-size');
+        if (after !== null) {
+            url += '&after=' + after;
+        }
+
+        button.disabled = true;
+        fetch(url, {credentials: 'same-origin'})
+            .then(function(response) { return response.json(); })
+            .then(function(page) {
+                page.submissions.forEach(appendRow);
+                after = page.next;
+                button.textContent = 'Load more';
+                button.disabled = after === null;
+                button.style.display = after === null ? 'none' : '';
+            })
+            .catch(function() {
+                button.disabled = false;
+            });
+    }
+
+    button.addEventListener('click', loadPage);
+});
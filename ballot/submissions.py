@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import answers, live, tallies, token_cache
+from .models import Submission, VotingEvent, VotingEventInvitation
+
+
+class AlreadyVoted(Exception):
+    """The invitation has already been used to submit a vote."""
+
+
+def record_vote(invitation, submission_data, token=None):
+    """
+    Store a member's vote and mark their invitation used, as one atomic unit.
+    The invitation is claimed first with a conditional UPDATE (used_at IS NULL), which takes the
+    row lock on PostgreSQL and the write lock on SQLite, so concurrent double-posts on the same
+    token queue up behind the first one and then find the invitation used. The unique constraint
+    on (voting_event, member) backs this up for any other path that might race us. Either way the
+    loser gets AlreadyVoted instead of an IntegrityError.
+    """
+    voting_event_id = invitation.voting_event_id
+    member = invitation.member
+    token = token or str(invitation.secret)
+
+    try:
+        with transaction.atomic():
+            claimed = VotingEventInvitation.objects.filter(pk=invitation.pk, used_at__isnull=True).update(
+                used_at=timezone.now()
+            )
+            if not claimed:
+                raise AlreadyVoted()
+
+            # Create the submission, its answer rows and the live tallies in the same transaction
+            submission = Submission.objects.create(
+                voting_event_id=voting_event_id,
+                member=member,
+                submission_data=submission_data
+            )
+            answers.record_answers(submission, member.membership_weight)
+            tallies.record_submission(submission, member.membership_weight)
+            if settings.BALLOT_PRECOMPUTED_COUNTERS:
+                # Keep the admin's turnout current between refresh_event_counters runs
+                VotingEvent.objects.filter(pk=voting_event_id).update(submission_total=F('submission_total') + 1)
+
+            transaction.on_commit(lambda: token_cache.evict(token))
+            transaction.on_commit(lambda: live.notify(voting_event_id))
+    except IntegrityError:
+        if Submission.objects.filter(voting_event_id=voting_event_id, member=member).exists():
+            raise AlreadyVoted()
+        raise
+
+    return submission
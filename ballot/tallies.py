@@ -0,0 +1,147 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef
+
+from .answers import summarize_answers
+from .models import Submission, SubmissionAnswer, Vote, VoteTally, VotingEvent
+
+
+class EventOpen(Exception):
+    """The voting event is open, so its tallies are still changing."""
+
+
+def record_submission(submission, weight):
+    """
+    Add a freshly created submission to the live tally table of its voting event.
+    Must be called inside the same transaction that created the submission, so that the
+    counters can never drift from the raw submissions. Rows are touched in vote id order
+    to keep lock acquisition consistent between concurrent voters.
+    """
+    for vote_key in sorted(submission.submission_data, key=int):
+        _increment(submission.voting_event_id, int(vote_key), submission.submission_data[vote_key], weight)
+
+
+def _increment(voting_event_id, vote_id, answer, weight):
+    """
+    Atomically bump a single (event, vote, answer) counter, creating the row on first use.
+    A concurrent voter may create the same row between our update and insert, in which
+    case the insert fails inside a savepoint and we fall back to the update again.
+    """
+    tally = VoteTally.objects.filter(voting_event_id=voting_event_id, vote_id=vote_id, answer=answer)
+    increments = {'count': F('count') + 1, 'weighted': F('weighted') + weight}
+
+    if tally.update(**increments):
+        return
+
+    try:
+        with transaction.atomic():
+            VoteTally.objects.create(
+                voting_event_id=voting_event_id,
+                vote_id=vote_id,
+                answer=answer,
+                count=1,
+                weighted=weight
+            )
+    except IntegrityError:
+        tally.update(**increments)
+
+
+def summarize_tallies(voting_event):
+    """
+    Build the report summary structure from the live tally table.
+    The result has the same shape as the summary computed from raw submissions:
+    {vote_id: {"count": {answer: n}, "weighted": {answer: total}}}.
+    """
+    summary = {}
+    rows = VoteTally.objects.filter(voting_event=voting_event).values_list('vote_id', 'answer', 'count', 'weighted')
+
+    for vote_id, answer, count, weighted in rows:
+        vote_summary = summary.setdefault(str(vote_id), {"count": {}, "weighted": {}})
+        vote_summary["count"][answer] = count
+        vote_summary["weighted"][answer] = weighted
+
+    return summary
+
+
+def compute_tallies(voting_event):
+    """
+    Recompute tallies for a voting event from its raw submissions.
+    Returns a dict keyed by (vote_id, answer) with [count, weighted] values. Answers are weighted
+    with the member weight snapshotted in their SubmissionAnswer rows at submit time, so later
+    roll imports or weight edits don't rewrite past results; only submissions without answer
+    rows fall back to the member's current weight. Answers for votes that no longer exist are
+    skipped, since their tally rows would have been removed together with the vote.
+    """
+    tallies = {}
+    for vote_key, result in summarize_answers(voting_event).items():
+        for answer, count in result['count'].items():
+            tallies[(int(vote_key), answer)] = [count, result['weighted'][answer]]
+
+    vote_ids = set(Vote.objects.filter(voting_event=voting_event).values_list('id', flat=True))
+    unanswered = Submission.objects.filter(voting_event=voting_event).filter(
+        ~Exists(SubmissionAnswer.objects.filter(submission=OuterRef('pk')))
+    ).values_list('submission_data', 'member__membership_weight')
+    for submission_data, weight in unanswered.iterator(chunk_size=2000):
+        for vote_key, answer in submission_data.items():
+            vote_id = int(vote_key)
+            if vote_id not in vote_ids:
+                continue
+            totals = tallies.setdefault((vote_id, answer), [0, 0])
+            totals[0] += 1
+            totals[1] += weight
+
+    return tallies
+
+
+def compare_tallies(voting_event, expected):
+    """
+    Compare the stored tally rows of a voting event against freshly computed tallies.
+    Returns a list of (vote_id, answer, stored, expected) tuples for every mismatching key,
+    where stored and expected are (count, weighted) pairs or None when the key is missing.
+    """
+    stored = {
+        (vote_id, answer): (count, weighted)
+        for vote_id, answer, count, weighted in VoteTally.objects.filter(
+            voting_event=voting_event
+        ).values_list('vote_id', 'answer', 'count', 'weighted')
+    }
+
+    mismatches = []
+    for key in sorted(set(stored) | set(expected)):
+        expected_totals = tuple(expected[key]) if key in expected else None
+        if stored.get(key) != expected_totals:
+            mismatches.append((key[0], key[1], stored.get(key), expected_totals))
+
+    return mismatches
+
+
+def rebuild_tallies(voting_event, force=False):
+    """
+    Replace the tally rows of a voting event with counts recomputed from raw submissions.
+    The event row is locked, and the recount, delete and insert happen in one transaction, so no
+    submission committed meanwhile is lost and reports never see a partial table. Open events are
+    refused with EventOpen unless force is set. Returns (row_count, mismatches), the mismatches
+    being compare_tallies() of the table before the rebuild.
+    """
+    with transaction.atomic():
+        locked_event = VotingEvent.objects.select_for_update().get(pk=voting_event.pk)
+        if locked_event.state == 'open' and not force:
+            raise EventOpen(f"{locked_event} is open for voting; close it first.")
+
+        tallies = compute_tallies(locked_event)
+        mismatches = compare_tallies(locked_event, tallies)
+        VoteTally.objects.filter(voting_event=locked_event).delete()
+        VoteTally.objects.bulk_create(
+            [
+                VoteTally(
+                    voting_event=locked_event,
+                    vote_id=vote_id,
+                    answer=answer,
+                    count=count,
+                    weighted=weighted
+                )
+                for (vote_id, answer), (count, weighted) in tallies.items()
+            ],
+            batch_size=1000
+        )
+
+    return len(tallies), mismatches
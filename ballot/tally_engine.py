@@ -0,0 +1,98 @@
+"""
+Array based tally engine for report summaries.
+
+Answers are encoded while they are streamed: every distinct (vote, answer) pair gets a
+categorical code in order of first appearance, so a submission becomes a few integers in flat
+arrays of codes and weights. Counting is then a single bincount over the codes (NumPy when it is
+installed, collections.Counter and a flat loop otherwise) instead of nested dict updates per answer.
+NumPy is an optional dependency, not listed in requirements.txt; install it to get the bincount.
+"""
+from array import array
+from collections import Counter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def backend():
+    return 'numpy' if numpy is not None else 'python'
+
+
+class TallyEngine:
+    """
+    Accumulates (votes, weight) submissions and produces the report summary structure
+    {vote_id: {"count": {answer: n}, "weighted": {answer: weight}}}, with votes and answers in
+    the same first-appearance order as the dict based accumulation in ballot.reports.
+    """
+
+    def __init__(self):
+        self.categories = {}  # (vote_id, answer) -> code
+        self.codes = array('q')
+        self.weights = array('q')
+        self.submissions = 0
+        self.total_weight = 0
+
+    def add(self, votes, weight):
+        categories = self.categories
+        for pair in votes.items():
+            code = categories.get(pair)
+            if code is None:
+                code = categories[pair] = len(categories)
+            self.codes.append(code)
+            self.weights.append(weight)
+        self.submissions += 1
+        self.total_weight += weight
+
+    def extend(self, rows):
+        for votes, weight in rows:
+            self.add(votes, weight)
+        return self
+
+    def counts(self):
+        """
+        (counts, weighted) sequences indexed by category code.
+        """
+        size = len(self.categories)
+        if numpy is not None:
+            codes = numpy.frombuffer(self.codes, dtype=numpy.int64)
+            weights = numpy.frombuffer(self.weights, dtype=numpy.int64)
+            counts = numpy.bincount(codes, minlength=size)
+            # bincount weights are float64; sums stay exact below 2**53
+            weighted = numpy.bincount(codes, weights=weights, minlength=size).round().astype(numpy.int64)
+            return counts.tolist(), weighted.tolist()
+
+        counted = Counter(self.codes)
+        counts = [counted[code] for code in range(size)]
+        weighted = [0] * size
+        for code, weight in zip(self.codes, self.weights):
+            weighted[code] += weight
+        return counts, weighted
+
+    def summary(self):
+        counts, weighted = self.counts()
+        vote_summaries = {}
+        for (vote_key, answer), code in self.categories.items():
+            vote_summary = vote_summaries.setdefault(vote_key, {"count": {}, "weighted": {}})
+            vote_summary["count"][answer] = counts[code]
+            vote_summary["weighted"][answer] = weighted[code]
+        return vote_summaries
+
+
+def turnout(submissions, submitted_weight, eligible_members, eligible_weight, quorum=None):
+    """
+    Turnout figures of a voting event. quorum is the required share (0-1) of the eligible
+    membership weight, or None when the event has no quorum.
+    """
+    weighted_share = submitted_weight / eligible_weight if eligible_weight else 0
+    return {
+        "eligible_members": eligible_members,
+        "eligible_weight": eligible_weight,
+        "submissions": submissions,
+        "weight": submitted_weight,
+        "percent": round(100 * submissions / eligible_members, 2) if eligible_members else 0,
+        "weighted_percent": round(100 * weighted_share, 2),
+        "quorum": quorum,
+        "quorum_reached": None if quorum is None else weighted_share >= quorum,
+    }
@@ -0,0 +1,130 @@
+"""
+Normalization and grouping of free-text (short_text) answers for report summaries.
+
+Answers are folded to a normal form (Unicode NFKC, casefold, collapsed whitespace) so that
+"Yes", "yes " and "YES" count as one answer, optionally clustered with near spellings through a
+character trigram index, and cut down to the top K groups plus an "other" bucket, so the size of
+a report summary does not grow with the number of distinct inputs.
+"""
+import unicodedata
+
+
+def normalize_answer(text):
+    """
+    Normal form of a free-text answer: NFKC, casefolded, with runs of whitespace collapsed.
+    """
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to clusters, used to find the cluster whose
+    representative is most similar (Jaccard similarity of trigram sets) to a new answer
+    without comparing it against every cluster.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.postings = {}
+        self.sizes = []
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def find(self, grams):
+        shared = {}
+        for gram in grams:
+            for cluster in self.postings.get(gram, ()):
+                shared[cluster] = shared.get(cluster, 0) + 1
+
+        best, best_similarity = None, self.threshold
+        for cluster, common in shared.items():
+            similarity = common / (len(grams) + self.sizes[cluster] - common)
+            if similarity >= best_similarity:
+                best, best_similarity = cluster, similarity
+        return best
+
+    def add(self, grams):
+        cluster = len(self.sizes)
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(cluster)
+        return cluster
+
+
+def group_answers(counts, weighted, top_k=20, fuzzy=False, threshold=0.6):
+    """
+    Group the raw answers of one short_text vote. counts and weighted map raw answers to their
+    count and weight. Returns (counts, weighted, other): the top_k groups by weight, each keyed by
+    its most frequent spelling with whitespace tidied, and None or {"answers", "count", "weighted"}
+    for the remaining groups.
+    With fuzzy, normalized answers whose trigram similarity to a group reaches threshold join it;
+    at most top_k * 10 groups are indexed, so clustering cost stays bounded as well.
+    """
+    groups = {}
+    for answer, count in counts.items():
+        group = groups.setdefault(normalize_answer(answer), {'count': 0, 'weighted': 0, 'spellings': {}})
+        group['count'] += count
+        group['weighted'] += weighted.get(answer, 0)
+        group['spellings'][answer] = group['spellings'].get(answer, 0) + count
+
+    ordered = sorted(groups.items(), key=lambda item: (-item[1]['weighted'], -item[1]['count'], item[0]))
+
+    if fuzzy:
+        index = TrigramIndex(threshold)
+        clusters, unclustered = [], []
+        for key, group in ordered:
+            grams = trigrams(key)
+            cluster = index.find(grams)
+            if cluster is not None:
+                merged = clusters[cluster]
+                merged['count'] += group['count']
+                merged['weighted'] += group['weighted']
+                for spelling, count in group['spellings'].items():
+                    merged['spellings'][spelling] = merged['spellings'].get(spelling, 0) + count
+            elif len(index) < top_k * 10:
+                index.add(grams)
+                clusters.append(group)
+            else:
+                unclustered.append(group)
+        ordered = [(None, group) for group in clusters + unclustered]
+        ordered.sort(key=lambda item: (-item[1]['weighted'], -item[1]['count']))
+
+    folded_counts, folded_weighted = {}, {}
+    for _, group in ordered[:top_k]:
+        label = ' '.join(max(group['spellings'].items(), key=lambda item: item[1])[0].split())
+        folded_counts[label] = group['count']
+        folded_weighted[label] = group['weighted']
+
+    rest = [group for _, group in ordered[top_k:]]
+    other = None
+    if rest:
+        other = {
+            'answers': len(rest),
+            'count': sum(group['count'] for group in rest),
+            'weighted': sum(group['weighted'] for group in rest),
+        }
+    return folded_counts, folded_weighted, other
+
+
+def fold_short_text_answers(summary, votes, top_k=20, fuzzy=False, threshold=0.6):
+    """
+    Apply group_answers to every short_text vote of a report summary, in place. Truncated votes
+    get an "other" entry next to "count" and "weighted". Returns the summary.
+    """
+    for vote in votes:
+        vote_summary = summary.get(vote['id'])
+        if vote['type'] != 'short_text' or not vote_summary:
+            continue
+        counts, weighted, other = group_answers(
+            vote_summary['count'], vote_summary['weighted'], top_k=top_k, fuzzy=fuzzy, threshold=threshold
+        )
+        vote_summary['count'], vote_summary['weighted'] = counts, weighted
+        if other:
+            vote_summary['other'] = other
+    return summary
@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import secret_for_token
+
+
+TokenEntry = namedtuple('TokenEntry', ['invitation_id', 'voting_event_id', 'member_id', 'used'])
+
+# Cached marker for tokens that don't belong to any invitation
+UNKNOWN = 'unknown'
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-process cache with a per-entry time to live.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            stale = [key for key, (expires_at, value) in self._data.items() if predicate(value)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_local = LRUCache(settings.BALLOT_TOKEN_CACHE_SIZE, settings.BALLOT_TOKEN_CACHE_TTL)
+_counters = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'evictions': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name, amount=1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def _shared_cache():
+    alias = settings.BALLOT_TOKEN_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def _key(token):
+    # Every spelling of a token maps to the secret it refers to, which is also bounded and backend-safe
+    return str(secret_for_token(token))
+
+
+def _shared_key(key):
+    return 'ballot:token:' + key
+
+
+def get(token):
+    """
+    Look a voting token up in the local LRU, then in the shared cache if one is configured.
+    Returns a TokenEntry, UNKNOWN for a token cached as invalid, or None on a miss.
+    """
+    key = _key(token)
+    value = _local.get(key)
+
+    if value is None:
+        shared = _shared_cache()
+        if shared is not None:
+            value = _from_shared(key, shared.get(_shared_key(key)))
+
+    return _counted(value)
+
+
+async def aget(token):
+    """
+    Async counterpart of get, reading the shared cache with the async cache API.
+    """
+    key = _key(token)
+    value = _local.get(key)
+
+    if value is None:
+        shared = _shared_cache()
+        if shared is not None:
+            value = _from_shared(key, await shared.aget(_shared_key(key)))
+
+    return _counted(value)
+
+
+def _from_shared(key, value):
+    if value is not None:
+        if value != UNKNOWN:
+            value = TokenEntry(*value)
+        _local.set(key, value)
+    return value
+
+
+def _counted(value):
+    if value is None:
+        _count('misses')
+    elif value == UNKNOWN:
+        _count('negative_hits')
+    else:
+        _count('hits')
+    return value
+
+
+def remember(token, invitation):
+    """
+    Cache what the voter endpoints need to know about the invitation of a token.
+    """
+    _store(token, _entry(invitation))
+
+
+async def aremember(token, invitation):
+    """
+    Async counterpart of remember.
+    """
+    await _astore(token, _entry(invitation))
+
+
+def remember_unknown(token):
+    """
+    Cache that a token does not belong to any invitation, so repeated lookups skip the database.
+    """
+    _store(token, UNKNOWN)
+
+
+async def aremember_unknown(token):
+    """
+    Async counterpart of remember_unknown.
+    """
+    await _astore(token, UNKNOWN)
+
+
+def _entry(invitation):
+    return TokenEntry(invitation.pk, invitation.voting_event_id, invitation.member_id, invitation.used_at is not None)
+
+
+def _store(token, value):
+    key = _key(token)
+    ttl = settings.BALLOT_TOKEN_CACHE_TTL
+    _local.set(key, value, ttl)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.set(_shared_key(key), tuple(value) if value != UNKNOWN else UNKNOWN, ttl)
+
+
+async def _astore(token, value):
+    key = _key(token)
+    ttl = settings.BALLOT_TOKEN_CACHE_TTL
+    _local.set(key, value, ttl)
+    shared = _shared_cache()
+    if shared is not None:
+        await shared.aset(_shared_key(key), tuple(value) if value != UNKNOWN else UNKNOWN, ttl)
+
+
+def evict(token):
+    """
+    Drop a token from the local and shared cache, e.g. once its invitation has been used.
+    """
+    key = _key(token)
+    _local.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_shared_key(key))
+    _count('evictions')
+
+
+def evict_event(voting_event, secrets=None):
+    """
+    Drop every cached token of a voting event, e.g. when it closes.
+    The shared cache can't be scanned, so its keys are derived from the event's invitation secrets.
+    """
+    evicted = _local.delete_where(lambda value: isinstance(value, TokenEntry) and value.voting_event_id == voting_event.pk)
+    shared = _shared_cache()
+    if shared is not None:
+        if secrets is None:
+            secrets = voting_event.invitations.values_list('secret', flat=True)
+        shared.delete_many([_shared_key(_key(secret)) for secret in secrets])
+    _count('evictions', evicted)
+
+
+def stats():
+    """
+    Hit/miss counters of this process plus the current size of the local LRU.
+    """
+    with _counters_lock:
+        counters = dict(_counters)
+    counters['size'] = len(_local)
+    return counters
+
+
+def clear():
+    """
+    Empty the local LRU and reset the counters (used by tests).
+    """
+    _local.clear()
+    with _counters_lock:
+        for name in _counters:
+            _counters[name] = 0
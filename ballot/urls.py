@@ -1,12 +1,21 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Serve the voter endpoints from the async views when running under an ASGI server
+if settings.BALLOT_ASYNC_VIEWS:
+    from . import async_views as voter_views
+else:
+    voter_views = views
+
 app_name = 'ballot'
 
 urlpatterns = [
-    path('vote/<str:token>/', views.vote_view, name='vote'),
-    path('vote/<str:token>/submit/', views.submit_vote, name='submit_vote'),
-    path('vote-closed/', views.vote_closed, name='vote_closed'),
-    path('already-voted/', views.already_voted, name='already_voted'),
-    path('vote-success/<int:voting_event_id>/', views.vote_success, name='vote_success'),
+    path('vote/<str:token>/', voter_views.vote_view, name='vote'),
+    path('vote/<str:token>/submit/', voter_views.submit_vote, name='submit_vote'),
+    path('vote-closed/', voter_views.vote_closed, name='vote_closed'),
+    path('already-voted/', voter_views.already_voted, name='already_voted'),
+    path('vote-success/<int:voting_event_id>/', voter_views.vote_success, name='vote_success'),
+    path('monitoring/token-cache/', views.token_cache_stats, name='token_cache_stats'),
+    path('monitoring/metrics/', views.metrics_view, name='metrics'),
 ]
@@ -1,111 +1,139 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponse, JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.urls import reverse
-from django.views.decorators.csrf import csrf_exempt
-from django.utils.crypto import get_random_string
-from .models import VotingEvent, Member, Submission, Vote, VotingEventInvitation
-import json
+from .models import VotingEvent
+from . import metrics, token_cache
+from .caching import get_ballot_definition
+from .instrumentation import tag_view
+from .loaders import load_invitation, load_votes
+from .submissions import AlreadyVoted, record_vote
 
 
-def vote_view(request, token):
-    """Display the voting form for a member with a valid token"""
-    # Get the invitation by token
-    invitation = get_object_or_404(VotingEventInvitation, secret=token)
-    
-    voting_event = invitation.voting_event
-    member = invitation.member
-    
+def _load_ballot(token):
+    """Return (invitation, None) for a voter who may see the ballot, or (invitation or None, response) otherwise"""
+    # Already used and unknown tokens are answered from the token cache without a query
+    cached = token_cache.get(token)
+    if isinstance(cached, token_cache.TokenEntry) and cached.used:
+        return None, redirect('ballot:already_voted')
+    
+    # Get the invitation with its event, member and access checks in one query
+    invitation = load_invitation(token, cached)
+    return invitation, _ballot_access_response(invitation)
+
+
+def _ballot_access_response(invitation):
+    """Return the response for a voter who may not see the ballot, or None if they may"""
     # Check if voting event is open
-    if voting_event.state != 'open':
+    if invitation.voting_event.state != 'open':
         return redirect('ballot:vote_closed')
     
     # Check if member is authorized for this voting event
-    if not voting_event.members.filter(pk=member.id).exists():
+    if not invitation.is_authorized:
         return HttpResponse("You are not authorized to vote in this event", status=403)
     
     # Check if member has already voted
-    if Submission.objects.filter(voting_event=voting_event, member=member).exists():
+    if invitation.has_voted:
         return redirect('ballot:already_voted')
     
-    # Get all votes for this voting event
-    votes = voting_event.votes.all()
+    return None
+
+
+def _collect_submission_data(request, votes):
+    """Build the submission data dict, keyed by vote id, from the posted ballot form"""
+    submission_data = {}
+    
+    for vote in votes:
+        field_name = f'vote_{vote.id}'
+        hidden_field_name = f'vote_{vote.id}_hidden'
+        
+        # For short_text votes, check if abstain was selected via hidden field
+        if vote.vote_type == 'short_text' and request.POST.get(hidden_field_name):
+            submission_data[str(vote.id)] = request.POST.get(hidden_field_name)
+        else:
+            # Always include the field, even if empty
+            submission_data[str(vote.id)] = request.POST.get(field_name, '')
+    
+    return submission_data
+
+
+@tag_view('ballot.vote_view')
+def vote_view(request, token):
+    """Display the voting form for a member with a valid token"""
+    invitation, denied = _load_ballot(token)
+    if denied:
+        return denied
+    
+    # Questions come from the per-event ballot cache, only token and CSRF are rendered per request
+    ballot_definition = get_ballot_definition(invitation.voting_event)
     
     context = {
-        'voting_event': voting_event,
-        'member': member,
-        'votes': votes,
+        'voting_event': invitation.voting_event,
+        'member': invitation.member,
+        'votes': ballot_definition['votes'],
+        'votes_html': ballot_definition['html'],
         'token': token,
     }
     
     return render(request, 'ballot/vote_form.html', context)
 
 
+@tag_view('ballot.submit_vote')
 def submit_vote(request, token):
     """Handle vote submission"""
     if request.method != 'POST':
         return redirect('ballot:vote', token=token)
     
-    # Get the invitation by token
-    invitation = get_object_or_404(VotingEventInvitation, secret=token)
+    invitation, denied = _load_ballot(token)
+    if denied:
+        return denied
     
     voting_event = invitation.voting_event
-    member = invitation.member
-    
-    # Check if voting event is open
-    if voting_event.state != 'open':
-        return redirect('ballot:vote_closed')
-    
-    # Check if member is authorized for this voting event
-    if not voting_event.members.filter(pk=member.id).exists():
-        return HttpResponse("You are not authorized to vote in this event", status=403)
-    
-    # Check if member has already voted
-    if Submission.objects.filter(voting_event=voting_event, member=member).exists():
-        return redirect('ballot:already_voted')
     
     # Collect submission data from form
-    submission_data = {}
-    votes = voting_event.votes.all()
+    submission_data = _collect_submission_data(request, load_votes(voting_event))
     
-    for vote in votes:
-        field_name = f'vote_{vote.id}'
-        hidden_field_name = f'vote_{vote.id}_hidden'
-        
-        # For short_text votes, check if abstain was selected via hidden field
-        if vote.vote_type == 'short_text' and request.POST.get(hidden_field_name):
-            submission_data[str(vote.id)] = request.POST.get(hidden_field_name)
-        else:
-            # Always include the field, even if empty
-            submission_data[str(vote.id)] = request.POST.get(field_name, '')
-    
-    # Create the submission
-    Submission.objects.create(
-        voting_event=voting_event,
-        member=member,
-        submission_data=submission_data
-    )
-    
-    # Mark invitation as used
-    from django.utils import timezone
-    invitation.used_at = timezone.now()
-    invitation.save()
+    # Store the vote and mark the invitation used atomically; a concurrent double-post loses here
+    try:
+        record_vote(invitation, submission_data, token=token)
+    except AlreadyVoted:
+        return redirect('ballot:already_voted')
     
     messages.success(request, 'Your vote has been submitted successfully!')
     return redirect('ballot:vote_success', voting_event_id=voting_event.id)
 
 
+@tag_view('ballot.vote_closed')
 def vote_closed(request):
     """Display message when voting is closed"""
     return render(request, 'ballot/vote_closed.html')
 
 
+@tag_view('ballot.already_voted')
 def already_voted(request):
     """Display message when member has already voted"""
     return render(request, 'ballot/already_voted.html')
 
 
+@tag_view('ballot.vote_success')
 def vote_success(request, voting_event_id):
     """Display success message after voting"""
     voting_event = get_object_or_404(VotingEvent, pk=voting_event_id)
     return render(request, 'ballot/vote_success.html', {'voting_event': voting_event})
+
+
+@tag_view('ballot.token_cache_stats')
+@staff_member_required
+def token_cache_stats(request):
+    """Expose the token cache hit/miss counters of this process for monitoring"""
+    return JsonResponse(token_cache.stats())
+
+
+@tag_view('ballot.metrics')
+def metrics_view(request):
+    """Expose the request metrics of this process in the Prometheus text format, to staff and allowed scrapers"""
+    allowed = request.META.get('REMOTE_ADDR') in settings.BALLOT_METRICS_ALLOWED_IPS
+    if not allowed and not (request.user.is_active and request.user.is_staff):
+        return HttpResponse("Forbidden", status=403)
+    return HttpResponse(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,47 @@
+"""
+gunicorn settings, read automatically when gunicorn starts in this directory, e.g.
+
+    gunicorn wsgi:application
+    GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker BALLOT_ASYNC_VIEWS=True gunicorn asgi:application
+
+Workers and threads are sized from the CPUs this process may run on; every GUNICORN_* variable
+overrides its default, and command line options override this file. Each worker thread keeps one
+database connection open (DATABASE_CONN_MAX_AGE), so the database has to accept
+workers x threads connections per server (the count is logged at startup; async workers don't
+use threads and open connections from their thread pool instead).
+"""
+import os
+
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+cpus = _cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# One process per CPU plus one, so a CPU never idles while a worker waits on the database; threads
+# cover the time requests spend waiting on the database and the network
+workers = int(os.environ.get('GUNICORN_WORKERS', cpus + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', min(max(2 * cpus, 4), 8)))
+if os.environ.get('GUNICORN_WORKER_CLASS'):
+    worker_class = os.environ['GUNICORN_WORKER_CLASS']
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then to bound the growth of per-process caches
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+
+def on_starting(server):
+    config = server.cfg
+    server.log.info(
+        "Starting %s %s workers x %s threads on %s CPUs: up to %s database connections per alias",
+        config.workers, config.worker_class_str, config.threads, cpus, config.workers * config.threads
+    )
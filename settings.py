@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import importlib.util
 import os
+import django
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -81,6 +84,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Report the number of SQL queries of every response in an X-Query-Count header. The loadtest
+# command turns this on for the server it starts; leave it off in production
+BALLOT_QUERY_COUNT_HEADER = os.environ.get('BALLOT_QUERY_COUNT_HEADER', 'False').lower() == 'true'
+if BALLOT_QUERY_COUNT_HEADER:
+    MIDDLEWARE.insert(0, 'ballot.middleware.QueryCountMiddleware')
+
 ROOT_URLCONF = 'urls'
 
 TEMPLATES = [
@@ -99,25 +108,149 @@ TEMPLATES = [
     },
 ]
 
+# Per-request instrumentation: wall time, SQL query count and time, template render time and
+# response size per view, exposed in the Prometheus text format at /monitoring/metrics/ (to staff,
+# and to scrapers connecting from BALLOT_METRICS_ALLOWED_IPS). Behind a reverse proxy every request
+# comes from the proxy's address, so no IP is allowed unless configured. Requests slower than
+# BALLOT_SLOW_REQUEST_MS are logged with their BALLOT_SLOW_REQUEST_TOP_QUERIES slowest queries
+BALLOT_INSTRUMENTATION = os.environ.get('BALLOT_INSTRUMENTATION', 'False').lower() == 'true'
+BALLOT_SLOW_REQUEST_MS = float(os.environ.get('BALLOT_SLOW_REQUEST_MS', 500))
+BALLOT_SLOW_REQUEST_TOP_QUERIES = int(os.environ.get('BALLOT_SLOW_REQUEST_TOP_QUERIES', 5))
+BALLOT_METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.environ.get('BALLOT_METRICS_ALLOWED_IPS', '').split(',') if ip.strip()
+]
+if BALLOT_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'ballot.middleware.InstrumentationMiddleware')
+    TEMPLATES[0]['BACKEND'] = 'ballot.instrumentation.InstrumentedDjangoTemplates'
+
 WSGI_APPLICATION = 'wsgi.application'
 
+# Route the voter endpoints to the async views in ballot.async_views. Enable this when serving
+# asgi:application with an ASGI server, e.g.
+#   gunicorn -k uvicorn_worker.UvicornWorker asgi:application
+BALLOT_ASYNC_VIEWS = os.environ.get('BALLOT_ASYNC_VIEWS', 'False').lower() == 'true'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connections are kept open between requests for DATABASE_CONN_MAX_AGE seconds (0 closes them at
+# the end of every request) and checked before reuse when DATABASE_CONN_HEALTH_CHECKS is on. Each
+# gunicorn worker thread holds one connection, so size max_connections (or the pgbouncer pool)
+# for workers x threads, see gunicorn.conf.py. Under ASGI (BALLOT_ASYNC_VIEWS) persistent
+# connections leak, one per thread the event loop hands database work to, so they must stay off
+# there; use DATABASE_POOL instead
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', 0 if BALLOT_ASYNC_VIEWS else 60))
+if BALLOT_ASYNC_VIEWS and DATABASE_CONN_MAX_AGE:
+    raise ImproperlyConfigured(
+        "DATABASE_CONN_MAX_AGE must be 0 with BALLOT_ASYNC_VIEWS: persistent connections leak under ASGI."
+    )
+DATABASE_CONN_HEALTH_CHECKS = os.environ.get('DATABASE_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+
+# PostgreSQL only: DATABASE_POOL=True (or a maximum pool size) uses Django's psycopg connection
+# pool instead of persistent connections. It needs Django 5.1+ and psycopg 3 with its pool
+# (pip install "psycopg[binary,pool]"), which requirements.txt doesn't install: it ships psycopg2.
+# DATABASE_PGBOUNCER=True makes the connections safe behind pgbouncer in transaction pooling
+# mode, where consecutive transactions may run on different server connections: no server-side
+# cursors and no prepared statements
+DATABASE_POOL = os.environ.get('DATABASE_POOL', '')
+DATABASE_PGBOUNCER = os.environ.get('DATABASE_PGBOUNCER', 'False').lower() == 'true'
+
 # Database configuration with environment variable support
 if os.environ.get('DATABASE_URL'):
     DATABASES = {
-        'default': dj_database_url.parse(os.environ.get('DATABASE_URL'))
+        'default': dj_database_url.parse(
+            os.environ.get('DATABASE_URL'),
+            conn_max_age=DATABASE_CONN_MAX_AGE,
+            conn_health_checks=DATABASE_CONN_HEALTH_CHECKS,
+            disable_server_side_cursors=DATABASE_PGBOUNCER
+        )
     }
 else:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / '..' / 'db.sqlite3',
+            'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DATABASE_CONN_HEALTH_CHECKS,
         }
     }
 
+# Optional read replica for admin reporting (report generation, report pages and exports), so
+# those long reads don't compete with voting on the primary. Voter views and all writes always
+# use the primary, see ballot.routers. In tests the replica alias reads the test database
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        conn_health_checks=DATABASE_CONN_HEALTH_CHECKS,
+        disable_server_side_cursors=DATABASE_PGBOUNCER,
+        test_options={'MIRROR': 'default'}
+    )
+BALLOT_REPLICA_ALIAS = 'replica'
+# Seconds an admin session keeps reading from the primary after generating a report, to cover
+# the replication lag
+BALLOT_REPLICA_STICKY_SECONDS = int(os.environ.get('BALLOT_REPLICA_STICKY_SECONDS', 10))
+DATABASE_ROUTERS = ['ballot.routers.PrimaryReplicaRouter']
+
+for database in DATABASES.values():
+    if database['ENGINE'] != 'django.db.backends.postgresql':
+        continue
+    if DATABASE_POOL.lower() not in ('', 'false', '0'):
+        pool_installed = importlib.util.find_spec('psycopg') and importlib.util.find_spec('psycopg_pool')
+        if django.VERSION < (5, 1) or not pool_installed:
+            raise ImproperlyConfigured(
+                'DATABASE_POOL needs Django 5.1 or later and psycopg 3 with its pool, '
+                'e.g. pip install "psycopg[binary,pool]".'
+            )
+        database.setdefault('OPTIONS', {})['pool'] = (
+            True if DATABASE_POOL.lower() == 'true' else {'min_size': 1, 'max_size': int(DATABASE_POOL)}
+        )
+        # Pooled connections go back to the pool after each request; Django refuses both at once
+        database['CONN_MAX_AGE'] = 0
+    if DATABASE_PGBOUNCER and importlib.util.find_spec('psycopg'):
+        # psycopg 3 prepares statements after a few executions; psycopg2 never does
+        database.setdefault('OPTIONS', {})['prepare_threshold'] = None
+
+# SQLite high-concurrency mode for single-node deployments: WAL, synchronous=NORMAL, a busy
+# timeout, mmap and a larger page cache on every connection (see ballot.sqlite), and write
+# transactions that start with BEGIN IMMEDIATE (needs Django 5.1 or later). Extra or different
+# pragmas go in BALLOT_SQLITE_PRAGMAS, e.g. {'busy_timeout': 10000}. Off by default: BEGIN
+# IMMEDIATE applies to every atomic() block, read-only ones included, so they queue for the write
+# lock too; turn it on (BALLOT_SQLITE_TUNING=True) after measuring with manage.py benchmark_sqlite
+BALLOT_SQLITE_TUNING = os.environ.get('BALLOT_SQLITE_TUNING', 'False').lower() == 'true'
+BALLOT_SQLITE_PRAGMAS = {}
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' and BALLOT_SQLITE_TUNING and django.VERSION >= (5, 1):
+    DATABASES['default'].setdefault('OPTIONS', {}).setdefault('transaction_mode', 'IMMEDIATE')
+
+# Run the test suite against an on-disk SQLite database rather than the shared-cache in-memory
+# one, whose table-level locking makes concurrent tests fail with "database table is locked"
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('TEST', {}).setdefault('NAME', str(BASE_DIR / '..' / 'test_db.sqlite3'))
+
+
+# Cache
+# Local-memory by default; point BALLOT_CACHE_ALIAS at a shared cache (e.g. Redis or Memcached
+# configured in CACHES) to share compiled ballots between processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ballot',
+    }
+}
+
+BALLOT_CACHE_ALIAS = os.environ.get('BALLOT_CACHE_ALIAS', 'default')
+
+# Cache the rendered question markup of each ballot, not just its vote definitions
+BALLOT_CACHE_RENDERED_BALLOT = os.environ.get('BALLOT_CACHE_RENDERED_BALLOT', 'True').lower() == 'true'
+
+# Voting token lookups are cached in an in-process LRU, and additionally in the cache alias
+# named by BALLOT_TOKEN_CACHE_ALIAS when set. Unknown tokens are cached too.
+BALLOT_TOKEN_CACHE_ALIAS = os.environ.get('BALLOT_TOKEN_CACHE_ALIAS') or None
+BALLOT_TOKEN_CACHE_SIZE = int(os.environ.get('BALLOT_TOKEN_CACHE_SIZE', '10000'))
+BALLOT_TOKEN_CACHE_TTL = int(os.environ.get('BALLOT_TOKEN_CACHE_TTL', '30'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -172,3 +305,45 @@ BREVO_API_KEY = os.environ.get('BREVO_API_KEY', '')
 # Email configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@yourdomain.com'
+
+# Source of the summary in generated voting reports: 'tallies' (live tally table),
+# 'answers' (GROUP BY over SubmissionAnswer), 'database' (GROUP BY over the submission
+# JSON in PostgreSQL, Python fallback elsewhere), 'python' or 'vectorized' (array based
+# tally engine). NumPy is optional and not in requirements.txt: 'vectorized' only counts with
+# numpy.bincount when it is installed (pip install numpy), and with collections.Counter otherwise
+BALLOT_REPORT_SUMMARY_MODE = os.environ.get('BALLOT_REPORT_SUMMARY_MODE', 'tallies')
+
+# Share (0-1) of the eligible membership weight that has to vote for a report to show the
+# quorum as reached; unset means voting events have no quorum
+BALLOT_REPORT_QUORUM = float(os.environ['BALLOT_REPORT_QUORUM']) if os.environ.get('BALLOT_REPORT_QUORUM') else None
+
+# Report summaries of short_text votes group answers by normal form (case, whitespace, Unicode),
+# keep the top K groups and fold the rest into an "other" bucket. With fuzzy clustering enabled,
+# near spellings whose trigram similarity reaches BALLOT_SHORT_TEXT_SIMILARITY are merged too
+BALLOT_SHORT_TEXT_TOP_K = int(os.environ.get('BALLOT_SHORT_TEXT_TOP_K', 20))
+BALLOT_SHORT_TEXT_FUZZY = os.environ.get('BALLOT_SHORT_TEXT_FUZZY', 'False').lower() == 'true'
+BALLOT_SHORT_TEXT_SIMILARITY = float(os.environ.get('BALLOT_SHORT_TEXT_SIMILARITY', 0.6))
+
+# Seconds between checks of the live turnout feed for votes committed by other server processes;
+# votes submitted through the same process are pushed immediately
+BALLOT_LIVE_POLL_INTERVAL = float(os.environ.get('BALLOT_LIVE_POLL_INTERVAL', 5))
+# Under WSGI a live turnout stream holds a worker thread, so it ends after this many seconds and
+# the admin has to resume it; under ASGI (BALLOT_ASYNC_VIEWS) streams hold no thread and don't end
+BALLOT_LIVE_MAX_SECONDS = float(os.environ.get('BALLOT_LIVE_MAX_SECONDS', 300))
+
+# Show the precomputed counter columns in the voting event changelist instead of counting with
+# subqueries on every page load; keep them fresh with the refresh_event_counters command
+BALLOT_PRECOMPUTED_COUNTERS = os.environ.get('BALLOT_PRECOMPUTED_COUNTERS', 'False').lower() == 'true'
+
+# Invitation email dispatch
+# Public base URL used to build the voting links in invitation emails
+BALLOT_BASE_URL = os.environ.get('BALLOT_BASE_URL', 'http://localhost:8000')
+
+# Mailer used by the dispatch_invitation_emails worker: ballot.mailers.BrevoMailer,
+# ballot.mailers.SMTPMailer or ballot.mailers.FakeMailer (in-memory, for offline load tests)
+BALLOT_INVITATION_MAILER = os.environ.get(
+    'BALLOT_INVITATION_MAILER',
+    'ballot.mailers.BrevoMailer' if BREVO_API_KEY else 'ballot.mailers.SMTPMailer'
+)
+BALLOT_FAKE_MAILER_LATENCY = float(os.environ.get('BALLOT_FAKE_MAILER_LATENCY', '0'))
+BALLOT_FAKE_MAILER_FAILURE_RATE = float(os.environ.get('BALLOT_FAKE_MAILER_FAILURE_RATE', '0'))